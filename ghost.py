@@ -1,34 +1,287 @@
 #!/usr/bin/env python3
 
-from bs4 import BeautifulSoup
 import argparse
-import datetime
-import jwt
+import base64
+import functools
+import hashlib
+import hmac
+import html
+import itertools
+import json
+import logging
 import os
-import requests
+import re
 import sys
 import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
+from urllib.parse import quote_plus, urlsplit, urlunsplit
 
-# Load environment variables
-load_dotenv()
+
+log = logging.getLogger(__name__)
+
+# orjson parses API responses straight from bytes and serializes request bodies much faster; it is optional
+try:
+    import orjson
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps
+except ImportError:
+    _json_loads = json.loads
+
+    def _json_dumps(data):
+        return json.dumps(data).encode('utf-8')
+
+# Ghost settings are needed for every command; Postmark and sender settings only for sending
+GHOST_REQUIRED_ENV_VARS = ('GHOST_ADMIN_API_KEY', 'GHOST_ADMIN_URL', 'GHOST_WEBSITE_URL')
+POSTMARK_REQUIRED_ENV_VARS = ('POSTMARK_SERVER_TOKEN', 'FROM_NAME', 'FROM_EMAIL')
+REQUIRED_ENV_VARS = GHOST_REQUIRED_ENV_VARS + POSTMARK_REQUIRED_ENV_VARS
+
+# Markup for one "keep reading" post in the newsletter; values must already be HTML-escaped
+ADDITIONAL_POST_HTML = '''
+                                            <table role="presentation" border="0" cellpadding="0" cellspacing="0" style="border-collapse: separate; mso-table-lspace: 0pt; mso-table-rspace: 0pt; width: 100%;" width="100%">
+                                                <tbody><tr>
+                                                    <td class="latest-post" style="font-family: Inter, -apple-system, BlinkMacSystemFont, avenir next, avenir, helvetica neue, helvetica, ubuntu, roboto, noto, segoe ui, arial, sans-serif; font-size: 18px; vertical-align: top; color: #15212A; padding: 16px 0; max-width: 600px;" valign="top">
+                                                        <table role="presentation" border="0" cellpadding="0" cellspacing="0" style="border-collapse: separate; mso-table-lspace: 0pt; mso-table-rspace: 0pt; width: 100%;" width="100%">
+                                                            <tbody><tr>
+                                                                <td valign="top" align="left" class="latest-post-title" style="font-family: Inter, -apple-system, BlinkMacSystemFont, avenir next, avenir, helvetica neue, helvetica, ubuntu, roboto, noto, segoe ui, arial, sans-serif; font-size: 18px; vertical-align: top; color: #15212A; padding-right: 12px;">
+                                                                    <h4 class="" style="margin-top: 0; font-family: Inter, -apple-system, BlinkMacSystemFont, avenir next, avenir, helvetica neue, helvetica, ubuntu, roboto, noto, segoe ui, arial, sans-serif; text-rendering: optimizeLegibility; line-height: 1.2em; margin: 0; padding: 2px 0 4px; font-size: 18px; font-weight: 700; color: #15212A;">
+                                                                        <a href="{url}" style="overflow-wrap: anywhere; text-decoration: none; color: #15212A;" target="_blank">{title}</a>
+                                                                    </h4>
+                                                                        <p class="latest-post-excerpt" style="line-height: 1.6em; margin: 0; padding: 0; font-size: 15px; font-weight: 400; color: #15212a; color: rgba(0, 0, 0, 0.6);">
+                                                                            <a href="{url}" style="overflow-wrap: anywhere; text-decoration: none; color: #15212a; color: rgba(0, 0, 0, 0.6);" target="_blank">{excerpt}</a>
+                                                                        </p>
+                                                                </td>{image_cell}
+                                                            </tr>
+                                                        </tbody></table>
+                                                    </td>
+                                                </tr>
+                                            </tbody></table>'''
+
+# Image column added to ADDITIONAL_POST_HTML when the post has a feature image
+ADDITIONAL_POST_IMAGE_HTML = '''
+                                                                        <td width="100" class="latest-post-img" style="font-family: Inter, -apple-system, BlinkMacSystemFont, avenir next, avenir, helvetica neue, helvetica, ubuntu, roboto, noto, segoe ui, arial, sans-serif; font-size: 18px; vertical-align: top; color: #15212A;" valign="top">
+                                                                            <a href="{url}" style="overflow-wrap: anywhere; display: block; height: 100px; overflow: hidden; color: inherit; text-decoration: none;" target="_blank">
+                                                                                <img src="{image}" width="100" height="100" style="border: none; -ms-interpolation-mode: bicubic; max-width: 100%; object-fit: cover;">
+                                                                            </a>
+                                                                        </td>'''
+
+# Email-compatible replacement for Ghost bookmark cards; values must already be HTML-escaped
+BOOKMARK_CARD_HTML = (
+    '<a href="{href}" style="text-decoration: none; color: inherit; display: block;" target="_blank">'
+    '<table border="0" cellpadding="0" cellspacing="0" style="width: 100%; max-width: 600px; margin: 24px 0; border: 1px solid #e0e7eb; border-radius: 8px; overflow: hidden; background-color: #ffffff;">'
+    '<tr><td style="padding: 20px; vertical-align: top;">'
+    '<div style="font-family: Inter, -apple-system, BlinkMacSystemFont, Roboto, Helvetica, Arial, sans-serif; font-size: 16px; font-weight: 600; color: #15212A; margin-bottom: 8px; line-height: 1.4;">{title}</div>'
+    '{description}{meta}</td>{thumbnail}</tr></table></a>'
+)
+BOOKMARK_DESCRIPTION_HTML = '<div style="font-family: Inter, -apple-system, BlinkMacSystemFont, Roboto, Helvetica, Arial, sans-serif; font-size: 14px; color: #738a94; margin-bottom: 12px; line-height: 1.5; overflow: hidden; display: -webkit-box; -webkit-line-clamp: 2; -webkit-box-orient: vertical;">{text}</div>'
+BOOKMARK_META_HTML = '<div style="display: flex; align-items: center; font-family: Inter, -apple-system, BlinkMacSystemFont, Roboto, Helvetica, Arial, sans-serif; font-size: 13px; color: #738a94;">{icon}{author}</div>'
+BOOKMARK_ICON_HTML = '<img alt="" src="{src}" style="width: 16px; height: 16px; margin-right: 8px; border-radius: 2px;"/>'
+BOOKMARK_THUMBNAIL_HTML = '<td style="width: 120px; padding: 20px 20px 20px 0; vertical-align: top;"><img alt="" src="{src}" style="width: 120px; height: 80px; object-fit: cover; border-radius: 4px;"/></td>'
+
+# Stands in for a bookmark card in the parsed tree until the rendered card is spliced in
+BOOKMARK_MARKER = '\x00bookmark\x00'
+
+@functools.lru_cache(maxsize=1)
+def load_env():
+    """Load the .env file next to this script once per process"""
+    script_dir = os.path.dirname(os.path.realpath(__file__))
+    load_dotenv(os.path.join(script_dir, '.env'), override=False)
+
+@functools.lru_cache(maxsize=8)
+def format_newsletter_date(interval, today):
+    """Format the newsletter date for an interval, given today's date ordinal"""
+    now = datetime.fromordinal(today)
+    if interval == 'weekly':
+        # For weekly, show week start date
+        week_start = now - timedelta(days=now.weekday())
+        return week_start.strftime("%B %d, %Y")
+    elif interval == 'monthly':
+        return now.strftime("%B %Y")
+    else:  # daily
+        return now.strftime("%B %d, %Y")
 
 class GhostNewsletterSender:
+    # Ghost settings related to branding and design, grouped for display
+    BRANDING_CATEGORIES = {
+        'Basic Branding': ('title', 'description', 'logo', 'icon', 'cover_image'),
+        'Colors & Theme': ('accent_color', 'brand_color', 'brand', 'brand_primary_color', 'theme', 'theme_config'),
+        'Navigation': ('navigation', 'secondary_navigation', 'header_style'),
+        'Social Media': ('facebook', 'twitter', 'linkedin', 'instagram', 'youtube', 'social_accounts', 'twitter_url', 'facebook_url'),
+        'SEO & Meta': ('meta_title', 'meta_description', 'og_image', 'og_title', 'og_description', 'twitter_image', 'twitter_title', 'twitter_description'),
+        'Portal/Membership': ('portal_button', 'portal_button_style', 'portal_button_signup_text', 'portal_button_icon', 'portal_plans', 'portal_products'),
+        'Email Design': ('email_header_image', 'email_footer', 'email_design'),
+        'Customization': ('codeinjection_head', 'codeinjection_foot', 'custom_css', 'custom_theme_settings')
+    }
+    
+    BRANDING_KEYS = frozenset(
+        [key for keys in BRANDING_CATEGORIES.values() for key in keys]
+        + ['site_language', 'timezone', 'default_locale']
+    )
+    
+    # Setting names that hint at design-related values outside BRANDING_KEYS
+    BRANDING_HINT_RE = re.compile(r'color|style|design|brand|theme|css|image|logo|icon', re.IGNORECASE)
+    
+    # Social sharing link templates; values must already be URL-encoded
+    TWITTER_SHARE_URL = "https://twitter.com/intent/tweet?text={text}&url={url}"
+    FACEBOOK_SHARE_URL = "https://www.facebook.com/sharer/sharer.php?u={url}"
+    LINKEDIN_SHARE_URL = "https://www.linkedin.com/sharing/share-offsite/?url={url}"
+    
+    # Branding capabilities reported by analyze_branding_capabilities
+    CAPABILITY_SCHEMA = {
+        '🏷️ Basic Identity': ('title', 'description', 'logo', 'icon', 'cover_image'),
+        '🎨 Visual Design': ('accent_color', 'brand_color', 'theme'),
+        '🧭 Navigation & UX': ('navigation', 'secondary_navigation', 'portal_button_style', 'portal_button_signup_text'),
+        '📱 Social Media': ('facebook', 'twitter', 'instagram', 'linkedin'),
+        '🔍 SEO & Sharing': ('meta_title', 'meta_description', 'og_image', 'twitter_image'),
+        '🔧 Customization': ('codeinjection_head', 'codeinjection_foot', 'custom_css')
+    }
+    
+    # Capabilities that can't be read from settings
+    CAPABILITY_PLACEHOLDERS = {'theme': 'Not accessible via settings'}
+    
+    # Status icons indexed by whether a capability is configured
+    CAPABILITY_STATUS = ("⚪", "✅")
+    
+    # Color schemes for Ghost callout cards, by callout color
+    CALLOUT_COLORS = {
+        'grey': {'bg': '#f8f9fa', 'border': '#e9ecef', 'text': '#495057'},
+        'blue': {'bg': '#e7f3ff', 'border': '#b3d9ff', 'text': '#0c5aa6'},
+        'green': {'bg': '#e8f5e8', 'border': '#c3e6c3', 'text': '#0f5132'},
+        'yellow': {'bg': '#fff3cd', 'border': '#ffd60a', 'text': '#664d03'},
+        'red': {'bg': '#f8d7da', 'border': '#f5c2c7', 'text': '#721c24'},
+        'pink': {'bg': '#f3e2f3', 'border': '#e1bee7', 'text': '#7b1fa2'},
+        'purple': {'bg': '#e1e7ff', 'border': '#c5d1ff', 'text': '#4c1d95'}
+    }
+    
+    # Callout card classes in the order they are checked, mapped to their color
+    CALLOUT_CLASS_TYPES = tuple(
+        (f'kg-callout-card-{callout_type}', callout_type)
+        for callout_type in ('blue', 'green', 'yellow', 'red', 'pink', 'purple')
+    )
+    
+    # Inline styles for each callout color: the card, its text, and elements inside the text
+    CALLOUT_STYLES = {
+        callout_type: {
+            'card': f"background-color: {colors['bg']}; border: 1px solid {colors['border']}; border-radius: 6px; padding: 16px 20px; margin: 24px 0; font-family: Inter, -apple-system, BlinkMacSystemFont, Roboto, Helvetica, Arial, sans-serif;",
+            'text': f"color: {colors['text']}; font-size: 16px; line-height: 1.5; margin: 0;",
+            'pre_wrap': f"white-space: pre-wrap; color: {colors['text']}; display: block; word-wrap: break-word",
+            'inline': f"color: {colors['text']}; word-wrap: break-word;"
+        }
+        for callout_type, colors in CALLOUT_COLORS.items()
+    }
+    
+    # Fallback values for render_conditional_template when data is missing
+    TEMPLATE_DEFAULTS = {
+        'blog_title': 'Newsletter',
+        'newsletter_interval': 'weekly',
+        'newsletter_date': 'Recent',
+        'featured_title': 'Latest Updates',
+        'featured_content': '<p>Check out our latest content!</p>',
+        'featured_url': '#',
+        'posts': [],
+        'blog_logo': '',
+        'social_twitter_url': '',
+        'newsletter_archive_url': ''
+    }
+    
+    # (conditional name, newsletter setting, default) for template blocks toggled by newsletter settings
+    NEWSLETTER_SETTING_CONDITIONALS = tuple(
+        (f'newsletter.settings.{setting_key}', setting_key, default)
+        for setting_key, default in (
+            ('show_header_icon', True), ('show_header_title', True), ('show_feature_image', True),
+            ('show_excerpt', True), ('show_author', False), ('show_latest_posts', True),
+            ('show_subscription_details', True)
+        )
+    )
+    
+    # {{#name}}...{{/name}} conditional blocks handled by render_conditional_template
+    CONDITIONAL_BLOCK_RE = re.compile(r'\{\{#([\w.]+)\}\}(.*?)\{\{/\1\}\}', re.DOTALL)
+    
+    # {{#if path}}...{{/if}} blocks handled by render_newsletter_template
+    TEMPLATE_IF_RE = re.compile(r'\{\{#if\s+([^}]+)\}\}(.*?)\{\{/if\}\}', re.DOTALL)
+    
+    # {{#if featured_image}}...{{/if}} section in single-post templates rendered by render_template
+    FEATURED_IMAGE_IF_RE = re.compile(r'\{\{#if featured_image\}\}(.*?)\{\{/if\}\}', re.DOTALL)
+    
+    # {{variable}} or raw {{{variable}}} placeholders, with the name in group 2
+    TEMPLATE_VARIABLE_RE = re.compile(r'\{\{(\{)?([\w.]+)\}\}(?(1)\})')
+    
+    # {{dotted.path}} placeholders, including the inside of {{{raw}}} ones
+    NESTED_VARIABLE_RE = re.compile(r'\{\{([\w.]+)\}\}')
+    
+    # Leftover {{variable}} placeholders, but not {{{raw}}} ones
+    UNRESOLVED_VARIABLE_RE = re.compile(r'(?<!\{)\{\{[^{}]+\}\}(?!\})')
+    
+    # Placeholders filled in per member, which must survive template rendering
+    MEMBER_PLACEHOLDERS = frozenset([
+        '{{member_name}}', '{{member_email}}', '{{member_created_at}}',
+        '{{subscription_renewal_date}}', '{{manage_subscription_url}}'
+    ])
+    
+    # Inline heading styles for process_content, matching Ghost's responsive font sizes
+    HEADING_STYLES = {
+        h_tag: f"font-family: Inter, -apple-system, BlinkMacSystemFont, avenir next, avenir, helvetica neue, helvetica, ubuntu, roboto, noto, segoe ui, arial, sans-serif; font-size: {font_size}px; font-weight: 700; margin: 24px 0 16px 0; line-height: 1.3; color: #2c3e50;"
+        for h_tag, font_size in (('h1', 32), ('h2', 26), ('h3', 21), ('h4', 19), ('h5', 17), ('h6', 15))
+    }
+    
+    # Inline styles process_content applies to post content, by tag name
+    CONTENT_TAG_STYLES = {
+        'p': "font-family: Inter, -apple-system, BlinkMacSystemFont, avenir next, avenir, helvetica neue, helvetica, ubuntu, roboto, noto, segoe ui, arial, sans-serif; font-size: 18px; font-weight: normal; margin: 0 0 16px 0; line-height: 1.6; color: #495057;",
+        'img': "width: 100%; height: auto; border-radius: 4px; margin: 16px 0;",
+        'a': "color: #007bff; text-decoration: none; font-weight: 500;",
+        'ul': "font-family: Inter, -apple-system, BlinkMacSystemFont, avenir next, avenir, helvetica neue, helvetica, ubuntu, roboto, noto, segoe ui, arial, sans-serif; margin: 16px 0; padding-left: 20px; color: #495057;",
+        'ol': "font-family: Inter, -apple-system, BlinkMacSystemFont, avenir next, avenir, helvetica neue, helvetica, ubuntu, roboto, noto, segoe ui, arial, sans-serif; margin: 16px 0; padding-left: 20px; color: #495057;",
+        'li': "font-family: Inter, -apple-system, BlinkMacSystemFont, avenir next, avenir, helvetica neue, helvetica, ubuntu, roboto, noto, segoe ui, arial, sans-serif; font-size: 18px; font-weight: normal; margin: 0 0 8px 0; line-height: 1.6; color: #495057;",
+        'blockquote': "font-family: Inter, -apple-system, BlinkMacSystemFont, avenir next, avenir, helvetica neue, helvetica, ubuntu, roboto, noto, segoe ui, arial, sans-serif; font-size: 18px; font-style: italic; margin: 24px 0; padding: 20px 24px; background-color: #f8f9fa; border-left: 4px solid #dee2e6; line-height: 1.6; color: #495057; border-radius: 0 6px 6px 0;",
+        'figcaption': "font-family: Inter, -apple-system, BlinkMacSystemFont, avenir next, avenir, helvetica neue, helvetica, ubuntu, roboto, noto, segoe ui, arial, sans-serif; font-size: 14px; color: #738a94; text-align: center; margin: 8px 0 16px 0; line-height: 1.4; font-style: italic;",
+        **HEADING_STYLES
+    }
+    
+    # Member placeholders filled in by personalize_newsletter_for_member
+    MEMBER_VARIABLE_RE = re.compile(r'\{\{(member_name|member_email|member_created_at|subscription_renewal_date)\}\}')
+    
+    # href attribute of an <a> tag, captured as (prefix, quote, value)
+    ANCHOR_HREF_RE = re.compile(r'(<a\s[^>]*?(?<![\w-])href\s*=\s*)(["\'])(.*?)\2', re.IGNORECASE | re.DOTALL)
+    
+    # Loose address check: one @, no whitespace, and a dot in the domain
+    EMAIL_RE = re.compile(r'^[^@\s]+@[^@\s]+\.[^@\s]+$')
+    
+    # Members per Ghost Admin API page; larger pages mean fewer requests but slower first results
+    MEMBERS_PAGE_SIZE = 100
+
+    # Member pages fetched concurrently; also caps how many fetched pages wait in memory
+    MEMBERS_FETCH_WORKERS = 8
+    
+    # Postmark accepts at most 500 messages and 50 MB per batch request
+    POSTMARK_BATCH_SIZE = 500
+    POSTMARK_BATCH_MAX_BYTES = 50 * 1000 * 1000
+    
+    # (connect, read) timeouts in seconds: fail fast on unreachable hosts, allow slow responses.
+    # Batch sends get a longer read timeout since Postmark processes up to 500 messages per call.
+    HTTP_TIMEOUT = (5, 30)
+    POSTMARK_BATCH_TIMEOUT = (5, 60)
+    
+    # Site settings that affect newsletter emails
+    EMAIL_SETTING_KEYS = frozenset([
+        'email_track_opens', 'email_track_clicks', 'default_email_address',
+        'support_email_address', 'heading_font', 'body_font'
+    ])
+    
     def __init__(self, max_posts=5, days_back=30, newsletter_interval='weekly', 
-                 filter_tags=None, featured_only=False, auto_interval=False):
+                 filter_tags=None, featured_only=False, auto_interval=False, require_postmark=True):
         # Newsletter configuration
         self.max_posts = max_posts
         self.days_back = days_back
         self.newsletter_interval = newsletter_interval
         self.filter_tags = filter_tags or []
+        self._filter_tags_lower = frozenset(tag.lower() for tag in self.filter_tags)
         self.featured_only = featured_only
         self.auto_interval = auto_interval
         
         # Load environment variables with explicit path
-        script_dir = os.path.dirname(os.path.realpath(__file__))
-        env_path = os.path.join(script_dir, '.env')
-        load_dotenv(env_path)
+        load_env()
         
         # Ghost API settings
         self.ghost_admin_api_key = os.getenv('GHOST_ADMIN_API_KEY')
@@ -36,12 +289,23 @@ class GhostNewsletterSender:
         self.ghost_admin_url = os.getenv('GHOST_ADMIN_URL')
         self.ghost_website_url = os.getenv('GHOST_WEBSITE_URL')
         self.ghost_test_email = os.getenv('GHOST_TEST_EMAIL')
+        self.ghost_newsletter_id = os.getenv('GHOST_NEWSLETTER_ID')
         
         # Postmark API settings
         self.postmark_server_token = os.getenv('POSTMARK_SERVER_TOKEN')
         self.from_name = os.getenv('FROM_NAME')
         self.from_email = os.getenv('FROM_EMAIL', 'subscriptions@brunoamaral.eu')
         self.message_stream = os.getenv('POSTMARK_MESSAGE_STREAM', 'broadcast')
+        self.footer_address = os.getenv('GHOST_NEWSLETTER_ADDRESS', f'{self.from_name}')
+        
+        # Postmark request headers and From field are the same for every message.
+        # The token stays out of the shared session so it is never sent to Ghost.
+        self._postmark_headers = {
+            "Accept": "application/json",
+            "Content-Type": "application/json",
+            "X-Postmark-Server-Token": self.postmark_server_token
+        }
+        self._from_addr = f'"{self.from_name}" <{self.from_email}>' if self.from_name else self.from_email
         
         # Check if we're in Postmark test mode
         self.is_postmark_test_mode = self.postmark_server_token == 'POSTMARK_API_TEST'
@@ -51,27 +315,103 @@ class GhostNewsletterSender:
         # Other settings
         self.website_domain = os.getenv('WEBSITE_DOMAIN')
         
-        # Validate required environment variables
-        required_vars = [
-            'GHOST_ADMIN_API_KEY', 'GHOST_ADMIN_URL', 'GHOST_WEBSITE_URL',
-            'POSTMARK_SERVER_TOKEN', 'FROM_NAME', 'FROM_EMAIL'
-        ]
+        # GHOST_DEBUG=1 turns on template rendering diagnostics
+        self.debug = os.getenv('GHOST_DEBUG') == '1'
         
-        missing_vars = [var for var in required_vars if not os.getenv(var)]
+        # Number of Postmark batch requests in flight at once while sending
+        try:
+            self.send_concurrency = max(1, int(os.getenv('SEND_CONCURRENCY', '4')))
+        except ValueError:
+            print("⚠️ Warning: SEND_CONCURRENCY is not a number, using 4")
+            self.send_concurrency = 4
+        
+        # Validate required environment variables; Ghost-only inspections can skip the Postmark ones
+        env = os.environ
+        required_vars = REQUIRED_ENV_VARS if require_postmark else GHOST_REQUIRED_ENV_VARS
+        missing_vars = tuple(var for var in required_vars if not env.get(var))
         if missing_vars:
             raise ValueError(f"Missing required environment variables: {', '.join(missing_vars)}")
+        
+        # Ghost API base URLs; GHOST_ADMIN_URL may be the site root or already end in /ghost/api/admin
+        ghost_base_url = self.ghost_admin_url.rstrip('/')
+        if ghost_base_url.endswith('/ghost/api/admin'):
+            ghost_base_url = ghost_base_url[:-len('/ghost/api/admin')]
+        self._admin_api_url = f"{ghost_base_url}/ghost/api/admin"
+        self._content_api_url = f"{ghost_base_url}/ghost/api/content"
+        
+        # Cached Ghost Admin API JWT (see generate_ghost_jwt)
+        self._key_id = None
+        self._key_secret_bytes = None
+        self._jwt_token = None
+        self._jwt_exp = 0
+        
+        # Blog settings rarely change during a run; fetched once on first use
+        self._blog_settings_cache = None
+        
+        # (hour, days) from the last successful detect_optimal_interval call
+        self._interval_cache = None
+        
+        # Ghost slugs for --filter-tags, looked up once; None until fetched, () if they can't all be resolved
+        self._filter_tag_slugs = None
+        
+        # Feedback URLs keyed by (post id, slug), and the UTM query string for the current week
+        self._feedback_urls_cache = {}
+        self._utm_tags_cache = (None, None)
+        
+        # Contents of the email template, re-read from disk only when its mtime changes
+        self._template_path = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'templates', 'ghost', 'newsletter_ghost_native.html')
+        self._template_cache = None
+        self._template_mtime = None
+        
+        # Shared HTTP session so repeated Ghost API calls reuse keep-alive connections.
+        # Imported here so --help and argument errors don't pay for loading requests.
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+        
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=10,
+            pool_maxsize=20,
+            # raise_on_status=False hands back the last response once retries run out, so the
+            # status-code error handling at each call site still runs
+            max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504],
+                              raise_on_status=False)
+        )
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.headers.update({
+            'Accept-Version': 'v5.0',
+            'Content-Type': 'application/json'
+        })
+
+    def close(self):
+        """Release pooled HTTP connections"""
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
 
     def generate_ghost_jwt(self):
         """Generate JWT token for Ghost Admin API authentication"""
+        # Tokens are valid for 5 minutes, so reuse the current one until shortly before it expires
+        now = int(time.time())
+        if self._jwt_token and now < self._jwt_exp - 30:
+            return self._jwt_token
+        
         try:
-            # Split the API key into ID and SECRET
-            key_id, key_secret = self.ghost_admin_api_key.split(':')
-            
-            # Convert hex secret to bytes
-            key_secret_bytes = bytes.fromhex(key_secret)
+            if self._key_secret_bytes is None:
+                # Split the API key into ID and SECRET
+                key_id, key_secret = self.ghost_admin_api_key.split(':')
+                
+                # Convert hex secret to bytes
+                self._key_secret_bytes = bytes.fromhex(key_secret)
+                self._key_id = key_id
             
             # Create JWT payload
-            now = int(time.time())
             payload = {
                 'iat': now,
                 'exp': now + 300,  # 5 minutes from now
@@ -82,100 +422,139 @@ class GhostNewsletterSender:
             header = {
                 'alg': 'HS256',
                 'typ': 'JWT',
-                'kid': key_id
+                'kid': self._key_id
             }
             
-            # Generate JWT token
-            token = jwt.encode(payload, key_secret_bytes, algorithm='HS256', headers=header)
-            return token
+            # Sign the token with HS256; Ghost only needs this, so PyJWT isn't required
+            signing_input = b'.'.join(self._jwt_segment(part) for part in (header, payload))
+            signature = hmac.new(self._key_secret_bytes, signing_input, hashlib.sha256).digest()
+            self._jwt_token = b'.'.join((signing_input, base64.urlsafe_b64encode(signature).rstrip(b'='))).decode('ascii')
+            self._jwt_exp = payload['exp']
+            return self._jwt_token
             
         except Exception as e:
             print(f"Error generating JWT token: {e}")
             return None
 
-    def get_ghost_members(self):
-        """Fetch all members and filter by specific newsletter subscription"""
+    @staticmethod
+    def _jwt_segment(data):
+        """Encode a JWT header or payload as compact, unpadded base64url JSON"""
+        return base64.urlsafe_b64encode(json.dumps(data, separators=(',', ':')).encode('utf-8')).rstrip(b'=')
+
+    @staticmethod
+    def _json(response):
+        """Decode a JSON response body"""
+        return _json_loads(response.content)
+
+    def _admin_get(self, endpoint, params=None):
+        """GET a Ghost Admin API endpoint, returning the response or None without a token"""
+        token = self.generate_ghost_jwt()
+        if not token:
+            return None
+        
+        url = f"{self._admin_api_url}/{endpoint}/"
+        return self.session.get(url, headers={'Authorization': f'Ghost {token}'}, params=params, timeout=self.HTTP_TIMEOUT)
+
+    def _fetch_members_page(self, page, headers, include_newsletters=True):
+        """Fetch a single page of subscribed members, returning (members, total_pages)"""
+        url = f"{self._admin_api_url}/members/"
+        params = {
+            'limit': self.MEMBERS_PAGE_SIZE,
+            'page': page,
+            'filter': 'subscribed:true'  # Only get generally subscribed members
+        }
+        if include_newsletters:
+            params['include'] = 'newsletters'  # Include newsletter subscription data
+
+        response = self.session.get(url, headers=headers, params=params, timeout=self.HTTP_TIMEOUT)
+
+        # A missing page would silently drop its members from the send, so fail loudly instead
+        if response.status_code != 200:
+            raise RuntimeError(f"Error fetching members page {page}: {response.status_code} - {response.text}")
+
+        data = self._json(response)
+        pagination = data.get('meta', {}).get('pagination', {})
+        return data.get('members', []), pagination.get('pages', 1)
+
+    def iter_ghost_members(self):
+        """Yield subscribed members page by page, filtered by newsletter subscription; raises if any page fails"""
         try:
             token = self.generate_ghost_jwt()
             if not token:
-                return []
-            
-            newsletter_id = os.getenv('GHOST_NEWSLETTER_ID')
-            if not newsletter_id:
-                print("⚠️ Warning: GHOST_NEWSLETTER_ID not set, fetching all subscribed members")
-            
-            headers = {
-                'Authorization': f'Ghost {token}',
-                'Content-Type': 'application/json',
-                'Accept-Version': 'v5.0'
-            }
-            
-            # Fetch all members with pagination
-            all_members = []
-            page = 1
-            limit = 100
-            
-            print(f"📧 Fetching all members to check newsletter subscriptions...")
-            
-            while True:
-                url = f"{self.ghost_admin_url}/ghost/api/admin/members/"
-                params = {
-                    'limit': limit,
-                    'page': page,
-                    'include': 'newsletters',  # Include newsletter subscription data
-                    'filter': 'subscribed:true'  # Only get generally subscribed members
-                }
-                
-                response = requests.get(url, headers=headers, params=params)
-                
-                if response.status_code != 200:
-                    print(f"Error fetching members: {response.status_code} - {response.text}")
-                    break
-                
-                data = response.json()
-                page_members = data.get('members', [])
-                all_members.extend(page_members)
-                
-                # Check if there are more pages
-                pagination = data.get('meta', {}).get('pagination', {})
-                if pagination.get('pages', 1) <= page:
-                    break
-                
-                page += 1
-            
-            print(f"📊 Fetched {len(all_members)} total subscribed members")
-            
-            # Now filter by specific newsletter subscription
-            newsletter_subscribers = []
-            
+                raise RuntimeError("Could not generate a Ghost Admin API token")
+
+            newsletter_id = self.ghost_newsletter_id
             if newsletter_id:
                 print(f"🎯 Filtering for newsletter ID: {newsletter_id}")
-                
-                for member in all_members:
-                    member_newsletters = member.get('newsletters', [])
-                    
-                    # Check if member is subscribed to our specific newsletter
-                    # The newsletters array contains only subscribed newsletters
-                    is_newsletter_subscriber = False
-                    for newsletter in member_newsletters:
-                        if newsletter.get('id') == newsletter_id:
-                            is_newsletter_subscriber = True
-                            break
-                    
-                    if is_newsletter_subscriber:
-                        newsletter_subscribers.append(member)
-                        
-                print(f"✅ Found {len(newsletter_subscribers)} members subscribed to newsletter '{newsletter_id}'")
-                return newsletter_subscribers
             else:
-                # If no newsletter ID specified, return all subscribed members
-                active_members = [member for member in all_members if member.get('email')]
-                print(f"Found {len(active_members)} subscribed members")
-                return active_members
-            
+                print("⚠️ Warning: GHOST_NEWSLETTER_ID not set, fetching all subscribed members")
+
+            headers = {'Authorization': f'Ghost {token}'}
+
+            print(f"📧 Fetching all members to check newsletter subscriptions...")
+
+            # The first page tells us how many pages there are; fetch the rest concurrently
+            # Subscription data is only needed to filter by newsletter
+            include_newsletters = bool(newsletter_id)
+            first_page, total_pages = self._fetch_members_page(1, headers, include_newsletters)
+
+            # Keep at most MEMBERS_FETCH_WORKERS later pages in flight, topping up one page at a time,
+            # and yield members in page order as each page is reached
+            executor = ThreadPoolExecutor(max_workers=self.MEMBERS_FETCH_WORKERS)
+            try:
+                def fetch_page(page):
+                    return self._fetch_members_page(page, headers, include_newsletters)[0]
+
+                remaining_pages = iter(range(2, total_pages + 1))
+                in_flight = deque(executor.submit(fetch_page, page)
+                                  for page in itertools.islice(remaining_pages, self.MEMBERS_FETCH_WORKERS))
+
+                invalid_count = 0
+                page_members = first_page
+                while True:
+                    for member in page_members:
+                        member_email = member.get('email')
+                        if not member_email:
+                            continue
+
+                        # Drop malformed addresses here rather than have Postmark reject them
+                        # (logged by member id so subscriber addresses stay out of the output)
+                        if not self.EMAIL_RE.match(member_email):
+                            log.info("Skipping member %s: invalid email address", member.get('id', 'unknown'))
+                            invalid_count += 1
+                            continue
+
+                        # The newsletters array contains only subscribed newsletters
+                        if newsletter_id and not any(n.get('id') == newsletter_id for n in member.get('newsletters', [])):
+                            continue
+
+                        yield member
+
+                    if not in_flight:
+                        if invalid_count:
+                            print(f"⚠️ Skipped {invalid_count} members with invalid email addresses")
+                        break
+                    page_members = in_flight.popleft().result()
+                    next_page = next(remaining_pages, None)
+                    if next_page is not None:
+                        in_flight.append(executor.submit(fetch_page, next_page))
+            finally:
+                # A failed page or a consumer that stops early shouldn't wait on pages nobody will read
+                executor.shutdown(wait=False, cancel_futures=True)
+
         except Exception as e:
             print(f"Error fetching Ghost members: {e}")
+            raise
+
+    def get_ghost_members(self):
+        """Fetch all members and filter by specific newsletter subscription"""
+        try:
+            members = list(self.iter_ghost_members())
+        except Exception:
+            # The member list would be incomplete; return nothing rather than a partial list
             return []
+        print(f"✅ Found {len(members)} subscribed members")
+        return members
 
     def get_ghost_member_by_email(self, email):
         """Fetch a specific member by email from Ghost Admin API"""
@@ -184,23 +563,19 @@ class GhostNewsletterSender:
             if not token:
                 return None
             
-            headers = {
-                'Authorization': f'Ghost {token}',
-                'Content-Type': 'application/json',
-                'Accept-Version': 'v5.0'
-            }
+            headers = {'Authorization': f'Ghost {token}'}
             
             # First try to find in members (subscribers)
-            url = f"{self.ghost_admin_url}/ghost/api/admin/members/"
+            url = f"{self._admin_api_url}/members/"
             params = {
                 'filter': f'email:{email}',
                 'limit': 1
             }
             
-            response = requests.get(url, headers=headers, params=params)
+            response = self.session.get(url, headers=headers, params=params, timeout=self.HTTP_TIMEOUT)
             
             if response.status_code == 200:
-                data = response.json()
+                data = self._json(response)
                 members = data.get('members', [])
                 if members:
                     member = members[0]
@@ -209,16 +584,16 @@ class GhostNewsletterSender:
             
             # If not found in members, try users (admins/staff)
             print(f"Member not found in subscribers, checking admin users...")
-            url = f"{self.ghost_admin_url}/ghost/api/admin/users/"
+            url = f"{self._admin_api_url}/users/"
             params = {
                 'filter': f'email:{email}',
                 'limit': 1
             }
             
-            response = requests.get(url, headers=headers, params=params)
+            response = self.session.get(url, headers=headers, params=params, timeout=self.HTTP_TIMEOUT)
             
             if response.status_code == 200:
-                data = response.json()
+                data = self._json(response)
                 users = data.get('users', [])
                 if users:
                     user = users[0]
@@ -241,25 +616,24 @@ class GhostNewsletterSender:
 
     def get_blog_settings_from_ghost(self):
         """Fetch blog settings from Ghost Admin API"""
+        if self._blog_settings_cache is not None:
+            return self._blog_settings_cache
+        
         try:
             token = self.generate_ghost_jwt()
             if not token:
                 return {}
             
-            headers = {
-                'Authorization': f'Ghost {token}',
-                'Content-Type': 'application/json',
-                'Accept-Version': 'v5.0'
-            }
+            headers = {'Authorization': f'Ghost {token}'}
             
-            url = f"{self.ghost_admin_url}/ghost/api/admin/settings/"
-            response = requests.get(url, headers=headers)
+            url = f"{self._admin_api_url}/settings/"
+            response = self.session.get(url, headers=headers, timeout=self.HTTP_TIMEOUT)
             
             if response.status_code != 200:
                 print(f"Warning: Could not fetch blog settings: {response.status_code}")
                 return {}
             
-            settings_data = response.json()
+            settings_data = self._json(response)
             settings = settings_data.get('settings', [])
             
             # Extract relevant settings
@@ -270,132 +644,95 @@ class GhostNewsletterSender:
                     blog_settings[key] = setting.get('value')
             
             print(f"Fetched blog settings: title='{blog_settings.get('title')}', logo={bool(blog_settings.get('logo'))}")
+            self._blog_settings_cache = blog_settings
             return blog_settings
             
         except Exception as e:
             print(f"Warning: Error fetching blog settings: {e}")
             return {}
 
-    def get_comprehensive_branding_settings(self):
+    def get_comprehensive_branding_settings(self, settings_response=None):
         """Fetch comprehensive branding and design settings from Ghost API"""
         try:
-            token = self.generate_ghost_jwt()
-            if not token:
-                print("❌ Could not generate JWT token")
+            # Fetch all settings unless the caller already did
+            if settings_response is None:
+                log.info("🔍 Fetching all Ghost settings...")
+                settings_response = self._admin_get('settings')
+            if settings_response is None:
+                log.error("❌ Could not generate JWT token")
                 return None
             
-            headers = {
-                'Authorization': f'Ghost {token}',
-                'Content-Type': 'application/json',
-                'Accept-Version': 'v5.0'
-            }
-            
-            # Fetch all settings
-            print("🔍 Fetching all Ghost settings...")
-            url = f"{self.ghost_admin_url}/ghost/api/admin/settings/"
-            response = requests.get(url, headers=headers)
-            
+            response = settings_response
             if response.status_code != 200:
-                print(f"❌ Could not fetch settings: {response.status_code} - {response.text}")
+                log.error("❌ Could not fetch settings: %s - %s", response.status_code, response.text)
                 return None
             
-            settings_data = response.json()
+            settings_data = self._json(response)
             all_settings = settings_data.get('settings', [])
             
-            # Categorize settings related to branding and design
-            branding_keys = [
-                # Basic branding
-                'title', 'description', 'logo', 'icon', 'cover_image',
-                # Brand colors and design
-                'accent_color', 'brand_color', 'brand', 'brand_primary_color',
-                # Navigation and appearance
-                'navigation', 'secondary_navigation', 'header_style',
-                # Social media
-                'facebook', 'twitter', 'linkedin', 'instagram', 'youtube',
-                'social_accounts', 'twitter_url', 'facebook_url',
-                # Meta and SEO
-                'meta_title', 'meta_description', 'og_image', 'og_title', 'og_description',
-                'twitter_image', 'twitter_title', 'twitter_description',
-                # Ghost-specific design
-                'theme', 'theme_config', 'custom_theme_settings',
-                # Portal/membership styling
-                'portal_button', 'portal_button_style', 'portal_button_signup_text',
-                'portal_button_icon', 'portal_plans', 'portal_products',
-                # Email branding
-                'email_header_image', 'email_footer', 'email_design',
-                # Site-wide settings
-                'site_language', 'timezone', 'default_locale',
-                # Custom settings
-                'codeinjection_head', 'codeinjection_foot', 'custom_css'
-            ]
-            
-            # Extract all settings and categorize them
+            # Split settings into branding-related and other settings in one pass,
+            # noting other settings whose names look design related
             branding_settings = {}
             other_settings = {}
+            potential_branding = []
+            configured_count = 0
             
             for setting in all_settings:
                 key = setting.get('key')
                 value = setting.get('value')
                 
-                if key in branding_keys:
+                if key in self.BRANDING_KEYS:
                     branding_settings[key] = value
+                    if value:
+                        configured_count += 1
                 else:
                     other_settings[key] = value
+                    if key and self.BRANDING_HINT_RE.search(key):
+                        potential_branding.append(key)
             
             # Print organized results
-            print("\n🎨 BRANDING & DESIGN SETTINGS FOUND:")
-            print("=" * 50)
-            
-            categories = {
-                'Basic Branding': ['title', 'description', 'logo', 'icon', 'cover_image'],
-                'Colors & Theme': ['accent_color', 'brand_color', 'brand', 'brand_primary_color', 'theme', 'theme_config'],
-                'Navigation': ['navigation', 'secondary_navigation', 'header_style'],
-                'Social Media': ['facebook', 'twitter', 'linkedin', 'instagram', 'youtube', 'social_accounts', 'twitter_url', 'facebook_url'],
-                'SEO & Meta': ['meta_title', 'meta_description', 'og_image', 'og_title', 'og_description', 'twitter_image', 'twitter_title', 'twitter_description'],
-                'Portal/Membership': ['portal_button', 'portal_button_style', 'portal_button_signup_text', 'portal_button_icon', 'portal_plans', 'portal_products'],
-                'Email Design': ['email_header_image', 'email_footer', 'email_design'],
-                'Customization': ['codeinjection_head', 'codeinjection_foot', 'custom_css', 'custom_theme_settings']
-            }
+            log.info("\n🎨 BRANDING & DESIGN SETTINGS FOUND:")
+            log.info("=" * 50)
             
-            for category, keys in categories.items():
+            for category, keys in self.BRANDING_CATEGORIES.items():
                 category_settings = {k: branding_settings.get(k) for k in keys if k in branding_settings}
                 if category_settings:
-                    print(f"\n📂 {category}:")
+                    log.info("\n📂 %s:", category)
                     for key, value in category_settings.items():
                         if value:
                             if isinstance(value, str) and len(value) > 100:
-                                print(f"  • {key}: {value[:97]}...")
+                                log.info("  • %s: %s...", key, value[:97])
                             else:
-                                print(f"  • {key}: {value}")
+                                log.info("  • %s: %s", key, value)
                         else:
-                            print(f"  • {key}: (empty)")
+                            log.info("  • %s: (empty)", key)
             
-            print(f"\n📊 SUMMARY:")
-            print(f"  • Total settings found: {len(all_settings)}")
-            print(f"  • Branding-related settings: {len(branding_settings)}")
-            print(f"  • Settings with values: {len([k for k, v in branding_settings.items() if v])}")
+            log.info("\n📊 SUMMARY:")
+            log.info("  • Total settings found: %s", len(all_settings))
+            log.info("  • Branding-related settings: %s", len(branding_settings))
+            log.info("  • Settings with values: %s", configured_count)
             
-            # Also check if there are any other potentially relevant settings
-            potential_branding = [k for k in other_settings.keys() if any(word in k.lower() for word in ['color', 'style', 'design', 'brand', 'theme', 'css', 'image', 'logo', 'icon'])]
+            # Also show any other potentially relevant settings
             if potential_branding:
-                print(f"\n🔍 OTHER POTENTIALLY RELEVANT SETTINGS:")
+                log.info("\n🔍 OTHER POTENTIALLY RELEVANT SETTINGS:")
                 for key in potential_branding[:10]:  # Show first 10
                     value = other_settings[key]
                     if isinstance(value, str) and len(value) > 50:
-                        print(f"  • {key}: {value[:47]}...")
+                        log.info("  • %s: %s...", key, value[:47])
                     else:
-                        print(f"  • {key}: {value}")
+                        log.info("  • %s: %s", key, value)
                 if len(potential_branding) > 10:
-                    print(f"  ... and {len(potential_branding) - 10} more")
+                    log.info("  ... and %s more", len(potential_branding) - 10)
             
             return {
                 'branding_settings': branding_settings,
+                'configured_count': configured_count,
                 'all_settings': {s.get('key'): s.get('value') for s in all_settings},
                 'total_count': len(all_settings)
             }
             
         except Exception as e:
-            print(f"❌ Error fetching comprehensive branding settings: {e}")
+            log.error("❌ Error fetching comprehensive branding settings: %s", e)
             return None
 
     def get_newsletter_settings(self):
@@ -406,49 +743,37 @@ class GhostNewsletterSender:
                 print("❌ Could not generate JWT token")
                 return None
             
-            headers = {
-                'Authorization': f'Ghost {token}',
-                'Content-Type': 'application/json',
-                'Accept-Version': 'v5.0'
-            }
+            headers = {'Authorization': f'Ghost {token}'}
             
             # Fetch newsletters
             print("📰 Fetching newsletter configuration...")
-            newsletters_url = f"{self.ghost_admin_url}/ghost/api/admin/newsletters/"
-            response = requests.get(newsletters_url, headers=headers)
+            newsletters_url = f"{self._admin_api_url}/newsletters/"
+            # Let Ghost pick the first active newsletter instead of listing them all
+            params = {'filter': 'status:active', 'limit': 1}
+            response = self.session.get(newsletters_url, headers=headers, params=params, timeout=self.HTTP_TIMEOUT)
             
             if response.status_code != 200:
                 print(f"❌ Could not fetch newsletters: {response.status_code}")
                 return None
             
-            newsletters_data = response.json()
-            newsletters = newsletters_data.get('newsletters', [])
-            
-            # Find active newsletter
-            active_newsletter = None
-            for newsletter in newsletters:
-                if newsletter.get('status') == 'active':
-                    active_newsletter = newsletter
-                    break
+            active_newsletter = (self._json(response).get('newsletters') or [None])[0]
             
             if not active_newsletter:
                 print("⚠️ No active newsletter found")
                 return None
             
             # Also get email settings from site settings
-            settings_url = f"{self.ghost_admin_url}/ghost/api/admin/settings/"
-            settings_response = requests.get(settings_url, headers=headers)
+            settings_url = f"{self._admin_api_url}/settings/"
+            settings_response = self.session.get(settings_url, headers=headers, timeout=self.HTTP_TIMEOUT)
             
             email_settings = {}
             if settings_response.status_code == 200:
-                all_settings = settings_response.json().get('settings', [])
-                email_keys = [
-                    'email_track_opens', 'email_track_clicks', 'default_email_address',
-                    'support_email_address', 'heading_font', 'body_font'
-                ]
-                for setting in all_settings:
-                    if setting.get('key') in email_keys:
-                        email_settings[setting.get('key')] = setting.get('value')
+                all_settings = self._json(settings_response).get('settings', [])
+                email_settings = {
+                    setting['key']: setting.get('value')
+                    for setting in all_settings
+                    if setting.get('key') in self.EMAIL_SETTING_KEYS
+                }
             
             return {
                 'newsletter': active_newsletter,
@@ -459,30 +784,22 @@ class GhostNewsletterSender:
             print(f"Error fetching newsletter settings: {e}")
             return None
 
-    def get_theme_information(self):
+    def get_theme_information(self, themes_response=None, site_response=None):
         """Fetch theme-specific information from Ghost API"""
         try:
-            token = self.generate_ghost_jwt()
-            if not token:
-                print("❌ Could not generate JWT token")
-                return None
-            
-            headers = {
-                'Authorization': f'Ghost {token}',
-                'Content-Type': 'application/json',
-                'Accept-Version': 'v5.0'
-            }
-            
-            print("🎭 Fetching theme information...")
-            
-            # Try to fetch themes endpoint
-            themes_url = f"{self.ghost_admin_url}/ghost/api/admin/themes/"
-            themes_response = requests.get(themes_url, headers=headers)
+            if themes_response is None or site_response is None:
+                if not self.generate_ghost_jwt():
+                    print("❌ Could not generate JWT token")
+                    return None
+                
+                print("🎭 Fetching theme information...")
+                themes_response = self._admin_get('themes')
+                site_response = self._admin_get('site')
             
             theme_info = {}
             
             if themes_response.status_code == 200:
-                themes_data = themes_response.json()
+                themes_data = self._json(themes_response)
                 themes = themes_data.get('themes', [])
                 
                 print(f"\n🎭 THEMES INFORMATION:")
@@ -512,12 +829,9 @@ class GhostNewsletterSender:
             else:
                 print(f"⚠️  Could not fetch themes: {themes_response.status_code}")
             
-            # Try to fetch site information
-            site_url = f"{self.ghost_admin_url}/ghost/api/admin/site/"
-            site_response = requests.get(site_url, headers=headers)
-            
+            # Site information
             if site_response.status_code == 200:
-                site_data = site_response.json()
+                site_data = self._json(site_response)
                 site_info = site_data.get('site', {})
                 
                 print(f"\n🌐 SITE INFORMATION:")
@@ -537,112 +851,96 @@ class GhostNewsletterSender:
 
     def analyze_branding_capabilities(self):
         """Analyze and summarize all available branding capabilities"""
-        print("🎨 GHOST API BRANDING & DESIGN CAPABILITIES ANALYSIS")
-        print("=" * 60)
+        log.info("🎨 GHOST API BRANDING & DESIGN CAPABILITIES ANALYSIS")
+        log.info("=" * 60)
+        
+        log.info("\n📋 WHAT THE GHOST API PROVIDES FOR BRANDING:")
         
-        print("\n📋 WHAT THE GHOST API PROVIDES FOR BRANDING:")
+        # Settings, themes and site info are independent, so fetch them concurrently
+        if not self.generate_ghost_jwt():
+            log.error("❌ Could not generate JWT token")
+            return
         
-        branding_data = self.get_comprehensive_branding_settings()
+        try:
+            with ThreadPoolExecutor(max_workers=3) as executor:
+                settings_future = executor.submit(self._admin_get, 'settings')
+                themes_future = executor.submit(self._admin_get, 'themes')
+                site_future = executor.submit(self._admin_get, 'site')
+            settings_response = settings_future.result()
+            themes_response = themes_future.result()
+            site_response = site_future.result()
+        except Exception as e:
+            log.error("❌ Could not fetch branding data: %s", e)
+            return
+        
+        branding_data = self.get_comprehensive_branding_settings(settings_response=settings_response)
         if not branding_data:
-            print("❌ Could not fetch branding data")
+            log.error("❌ Could not fetch branding data")
             return
             
         branding_settings = branding_data.get('branding_settings', {})
         
         # Analyze what's available vs what's configured
-        capabilities = {
-            '🏷️ Basic Identity': {
-                'title': branding_settings.get('title'),
-                'description': branding_settings.get('description'),
-                'logo': branding_settings.get('logo'),
-                'icon': branding_settings.get('icon'),
-                'cover_image': branding_settings.get('cover_image')
-            },
-            '🎨 Visual Design': {
-                'accent_color': branding_settings.get('accent_color'),
-                'brand_color': branding_settings.get('brand_color'),
-                'theme': branding_settings.get('active_theme', 'Not accessible via settings')
-            },
-            '🧭 Navigation & UX': {
-                'navigation': branding_settings.get('navigation'),
-                'secondary_navigation': branding_settings.get('secondary_navigation'),
-                'portal_button_style': branding_settings.get('portal_button_style'),
-                'portal_button_signup_text': branding_settings.get('portal_button_signup_text')
-            },
-            '📱 Social Media': {
-                'facebook': branding_settings.get('facebook'),
-                'twitter': branding_settings.get('twitter'),
-                'instagram': branding_settings.get('instagram'),
-                'linkedin': branding_settings.get('linkedin')
-            },
-            '🔍 SEO & Sharing': {
-                'meta_title': branding_settings.get('meta_title'),
-                'meta_description': branding_settings.get('meta_description'),
-                'og_image': branding_settings.get('og_image'),
-                'twitter_image': branding_settings.get('twitter_image')
-            },
-            '🔧 Customization': {
-                'codeinjection_head': branding_settings.get('codeinjection_head'),
-                'codeinjection_foot': branding_settings.get('codeinjection_foot'),
-                'custom_css': branding_settings.get('custom_css')
-            }
-        }
-        
-        for category, items in capabilities.items():
-            print(f"\n{category}:")
+        for category, keys in self.CAPABILITY_SCHEMA.items():
+            log.info("\n%s:", category)
             configured_count = 0
-            total_count = len(items)
+            total_count = len(keys)
             
-            for key, value in items.items():
-                status = "✅" if value else "⚪"
+            for key in keys:
+                value = self.CAPABILITY_PLACEHOLDERS.get(key) or branding_settings.get(key)
+                status = self.CAPABILITY_STATUS[bool(value)]
                 if value and isinstance(value, str) and len(value) > 60:
                     value_display = value[:57] + "..."
                 else:
                     value_display = value or "(not configured)"
                     
-                print(f"  {status} {key}: {value_display}")
+                log.info("  %s %s: %s", status, key, value_display)
                 if value:
                     configured_count += 1
             
-            print(f"    → {configured_count}/{total_count} configured")
+            log.info("    → %s/%s configured", configured_count, total_count)
         
         # Theme information
-        print(f"\n🎭 THEME INFORMATION:")
-        theme_data = self.get_theme_information()
+        log.info("\n🎭 THEME INFORMATION:")
+        theme_data = self.get_theme_information(themes_response=themes_response, site_response=site_response)
         if theme_data and 'site_info' in theme_data:
             site_info = theme_data['site_info']
-            print(f"  • Ghost Version: {site_info.get('version', 'Unknown')}")
-            print(f"  • Site URL: {site_info.get('url', 'Unknown')}")
+            log.info("  • Ghost Version: %s", site_info.get('version', 'Unknown'))
+            log.info("  • Site URL: %s", site_info.get('url', 'Unknown'))
             
-        print(f"\n💡 SUMMARY:")
+        log.info("\n💡 SUMMARY:")
         total_settings = branding_data.get('total_count', 0)
         branding_count = len(branding_settings)
-        configured_count = len([v for v in branding_settings.values() if v])
+        configured_count = branding_data.get('configured_count', 0)
+        completeness = 100.0 * configured_count / branding_count if branding_count else 0.0
         
-        print(f"  • Total Ghost settings: {total_settings}")
-        print(f"  • Branding-related: {branding_count}")
-        print(f"  • Currently configured: {configured_count}")
-        print(f"  • Configuration completeness: {configured_count/branding_count*100:.1f}%")
+        log.info("  • Total Ghost settings: %s", total_settings)
+        log.info("  • Branding-related: %s", branding_count)
+        log.info("  • Currently configured: %s", configured_count)
+        log.info("  • Configuration completeness: %.1f%%", completeness)
         
-        print(f"\n🚀 RECOMMENDATIONS FOR NEWSLETTER BRANDING:")
-        print("  • ✅ Basic identity (title, logo, description) is well configured")
+        log.info("\n🚀 RECOMMENDATIONS FOR NEWSLETTER BRANDING:")
+        log.info("  • ✅ Basic identity (title, logo, description) is well configured")
         if not branding_settings.get('accent_color'):
-            print("  • ⚠️  Consider setting an accent color for brand consistency")
+            log.info("  • ⚠️  Consider setting an accent color for brand consistency")
         if not branding_settings.get('meta_title'):
-            print("  • ⚠️  Add meta title and description for better SEO")
+            log.info("  • ⚠️  Add meta title and description for better SEO")
         if not branding_settings.get('facebook') and not branding_settings.get('twitter'):
-            print("  • ⚠️  Add social media links to increase engagement")
+            log.info("  • ⚠️  Add social media links to increase engagement")
             
         return branding_data
 
     def detect_optimal_interval(self):
         """Auto-detect optimal newsletter interval based on posting frequency"""
+        # Posting frequency doesn't change within the hour, so reuse a recent answer
+        hour_bucket = int(time.time() // 3600)
+        if self._interval_cache is not None and self._interval_cache[0] == hour_bucket:
+            return self._interval_cache[1]
+        
         try:
             # Fetch posts from last 60 days to analyze frequency
-            base_url = self.ghost_admin_url.replace('/ghost/api/admin', '')
-            url = f"{base_url}/ghost/api/content/posts/"
+            url = f"{self._content_api_url}/posts/"
             
-            headers = {'Accept-Version': 'v5.0'}
             params = {
                 'key': self.ghost_content_api_key,
                 'limit': 20,
@@ -650,78 +948,148 @@ class GhostNewsletterSender:
                 'filter': f'published_at:>={(datetime.now() - timedelta(days=60)).strftime("%Y-%m-%d")}'
             }
             
-            response = requests.get(url, headers=headers, params=params)
+            response = self.session.get(url, params=params, timeout=self.HTTP_TIMEOUT)
             if response.status_code != 200:
                 return self.days_back  # Fallback to default
             
-            posts = response.json().get('posts', [])
+            posts = self._json(response).get('posts', [])
             if len(posts) < 2:
                 return self.days_back
             
-            # Calculate average days between posts
-            post_dates = [datetime.fromisoformat(post['published_at'].replace('Z', '+00:00')) for post in posts]
-            intervals = [(post_dates[i] - post_dates[i+1]).days for i in range(len(post_dates)-1)]
-            avg_interval = sum(intervals) / len(intervals)
+            # Calculate average days between posts in a single pass (posts are newest first)
+            previous_date = None
+            total_days = 0
+            interval_count = 0
+            for post in posts:
+                post_date = datetime.fromisoformat(post['published_at'].replace('Z', '+00:00'))
+                if previous_date is not None:
+                    total_days += (previous_date - post_date).days
+                    interval_count += 1
+                previous_date = post_date
+            avg_interval = total_days / interval_count
             
             # Determine optimal newsletter frequency
             if avg_interval <= 2:  # Daily posting
-                return 7  # Weekly newsletter
+                interval = 7  # Weekly newsletter
             elif avg_interval <= 7:  # Weekly posting
-                return 14  # Bi-weekly newsletter
+                interval = 14  # Bi-weekly newsletter
             else:  # Monthly or less
-                return 30  # Monthly newsletter
+                interval = 30  # Monthly newsletter
+            
+            self._interval_cache = (hour_bucket, interval)
+            return interval
                 
         except Exception as e:
             print(f"Warning: Auto-interval detection failed: {e}")
             return self.days_back
 
+    def build_posts_filter(self, date_filter):
+        """Build a Content API filter so Ghost applies the date, featured and tag criteria"""
+        filter_parts = [f'published_at:>={date_filter}']
+        if self.featured_only:
+            filter_parts.append('featured:true')
+        if self.filter_tags:
+            # Ghost matches tags by slug; when any name can't be resolved, filter_posts_by_criteria does it by name
+            tag_slugs = self.get_filter_tag_slugs()
+            if tag_slugs:
+                filter_parts.append(f"tag:[{','.join(tag_slugs)}]")
+        return '+'.join(filter_parts)
+
+    def get_filter_tag_slugs(self):
+        """Look up the real Ghost slugs for the --filter-tags names, or () if any is missing"""
+        if self._filter_tag_slugs is not None:
+            return self._filter_tag_slugs
+        
+        self._filter_tag_slugs = ()
+        try:
+            url = f"{self._content_api_url}/tags/"
+            params = {'key': self.ghost_content_api_key, 'limit': 'all', 'fields': 'name,slug'}
+            response = self.session.get(url, params=params, timeout=self.HTTP_TIMEOUT)
+            if response.status_code != 200:
+                print(f"Error fetching tags from Ghost API: {response.status_code} - {response.text}")
+                return self._filter_tag_slugs
+            
+            # Tag names match case-insensitively, like _post_matches_criteria
+            slugs_by_name = {tag.get('name', '').lower(): tag.get('slug') for tag in self._json(response).get('tags', [])}
+            tag_slugs = tuple(slugs_by_name.get(name) for name in self._filter_tags_lower)
+            if all(tag_slugs):
+                self._filter_tag_slugs = tag_slugs
+        except Exception as e:
+            print(f"Error fetching tags from Ghost API: {e}")
+        
+        return self._filter_tag_slugs
+
     def filter_posts_by_criteria(self, posts):
         """Filter posts based on tags and featured status"""
+        # Ghost already applies these criteria via build_posts_filter; this is a name-based safety net
         if not posts:
             return posts
         
-        filtered_posts = []
+        return [post for post in posts if self._post_matches_criteria(post)]
+
+    def _post_matches_criteria(self, post):
+        """Check a single post against the tag and featured filters"""
+        # Filter by featured status
+        if self.featured_only and not post.get('featured', False):
+            return False
         
-        for post in posts:
-            # Filter by featured status
-            if self.featured_only and not post.get('featured', False):
-                continue
-            
-            # Filter by tags
-            if self.filter_tags:
-                post_tags = [tag.get('name', '').lower() for tag in post.get('tags', [])]
-                if not any(tag.lower() in post_tags for tag in self.filter_tags):
-                    continue
-            
-            filtered_posts.append(post)
+        # Filter by tags (case-insensitive, any match keeps the post)
+        if self._filter_tags_lower and self._filter_tags_lower.isdisjoint(
+                tag.get('name', '').lower() for tag in post.get('tags', [])):
+            return False
         
-        return filtered_posts
+        return True
 
     def enhance_post_images(self, posts, blog_settings=None):
         """Enhance post images with fallbacks and optimization"""
         # Cache blog settings to avoid multiple API calls
         if blog_settings is None:
             blog_settings = self.get_blog_settings_from_ghost()
+        
+        # Blog logo or cover image used for posts without their own image
+        fallback_image = blog_settings.get('logo') or blog_settings.get('cover_image')
             
         for post in posts:
-            feature_image = post.get('feature_image')
-            
-            if feature_image:
-                # Add image optimization parameters for Ghost images
-                if 'brunoamaral.eu' in feature_image or 'ghost' in feature_image.lower():
-                    # Add Ghost image optimization
-                    post['feature_image_optimized'] = f"{feature_image}?w=600&h=300&fit=crop"
-                    post['feature_image_small'] = f"{feature_image}?w=300&h=150&fit=crop"
-                else:
-                    post['feature_image_optimized'] = feature_image
-                    post['feature_image_small'] = feature_image
-            else:
-                # Use blog logo or default image as fallback
-                post['feature_image_optimized'] = blog_settings.get('logo') or blog_settings.get('cover_image')
-                post['feature_image_small'] = post['feature_image_optimized']
+            self._enhance_post_image(post, fallback_image)
         
         return posts
 
+    def _enhance_post_image(self, post, fallback_image):
+        """Add optimized image URLs to a single post"""
+        feature_image = post.get('feature_image')
+        
+        if feature_image:
+            # Add image optimization parameters for Ghost images
+            if 'brunoamaral.eu' in feature_image or 'ghost' in feature_image.lower():
+                # Add Ghost image optimization
+                post['feature_image_optimized'] = f"{feature_image}?w=600&h=300&fit=crop"
+                post['feature_image_small'] = f"{feature_image}?w=300&h=150&fit=crop"
+            else:
+                post['feature_image_optimized'] = feature_image
+                post['feature_image_small'] = feature_image
+        else:
+            # Use blog logo or default image as fallback
+            post['feature_image_optimized'] = fallback_image
+            post['feature_image_small'] = fallback_image
+        
+        return post
+
+    def _select_posts(self, posts, limit, blog_settings, exclude_id=None):
+        """Filter and enhance posts in one pass, stopping once limit posts are kept"""
+        fallback_image = blog_settings.get('logo') or blog_settings.get('cover_image')
+        selected = []
+        
+        for post in posts:
+            if len(selected) >= limit:
+                break
+            if exclude_id is not None and post.get('id') == exclude_id:
+                continue
+            if not self._post_matches_criteria(post):
+                continue
+            selected.append(self._enhance_post_image(post, fallback_image))
+        
+        return selected
+
     def generate_social_sharing_data(self, posts):
         """Generate social media sharing data for posts"""
         if not posts:
@@ -733,10 +1101,14 @@ class GhostNewsletterSender:
         newsletter_title = f"{self.from_name} Newsletter - {featured_post.get('title', '')}"
         newsletter_url = f"{self.ghost_website_url}/newsletters" if self.ghost_website_url else ""
         
+        # Encode once so titles with &, ? or spaces don't break the share links
+        encoded_title = quote_plus(newsletter_title)
+        encoded_url = quote_plus(newsletter_url)
+        
         return {
-            'twitter_url': f"https://twitter.com/intent/tweet?text={newsletter_title}&url={newsletter_url}",
-            'facebook_url': f"https://www.facebook.com/sharer/sharer.php?u={newsletter_url}",
-            'linkedin_url': f"https://www.linkedin.com/sharing/share-offsite/?url={newsletter_url}",
+            'twitter_url': self.TWITTER_SHARE_URL.format(text=encoded_title, url=encoded_url),
+            'facebook_url': self.FACEBOOK_SHARE_URL.format(url=encoded_url),
+            'linkedin_url': self.LINKEDIN_SHARE_URL.format(url=encoded_url),
             'newsletter_title': newsletter_title,
             'newsletter_url': newsletter_url
         }
@@ -748,17 +1120,23 @@ class GhostNewsletterSender:
         
         post_id = post.get('id', 'default-post-id')
         post_slug = post.get('slug', 'default-slug')
+        cache_key = (post_id, post_slug)
+        if cache_key in self._feedback_urls_cache:
+            return self._feedback_urls_cache[cache_key]
+        
         base_url = self.ghost_website_url or ""
         
         # Generate UUID and key for feedback (in real implementation, these would be unique)
         feedback_uuid = "example-uuid"  # In production, generate actual UUID
         feedback_key = "93de5448e0cb83c7f0cc081a1808ba37f1d2054ae0d73a643cf86e68d657baf9"  # In production, generate actual key
         
-        return {
+        feedback_urls = {
             'feedback_more_url': f"{base_url}/#/feedback/{post_id}/1/?uuid={feedback_uuid}&key={feedback_key}",
             'feedback_less_url': f"{base_url}/#/feedback/{post_id}/0/?uuid={feedback_uuid}&key={feedback_key}",
             'comment_url': f"{base_url}/{post_slug}/#ghost-comments-root"
         }
+        self._feedback_urls_cache[cache_key] = feedback_urls
+        return feedback_urls
 
     def get_prioritized_posts_for_newsletter(self, max_posts=5, days_back=30):
         """Fetch posts with featured post prioritization from last 7 days"""
@@ -772,19 +1150,12 @@ class GhostNewsletterSender:
                 days_back = self.detect_optimal_interval()
                 print(f"🤖 Auto-detected interval: {days_back} days")
             
-            from datetime import datetime, timedelta
-            
             # First, look for featured posts in the last 7 days
             featured_cutoff = datetime.now() - timedelta(days=7)
             featured_date_filter = featured_cutoff.strftime('%Y-%m-%d')
             
             # Build the API URL
-            base_url = self.ghost_admin_url.replace('/ghost/api/admin', '')
-            url = f"{base_url}/ghost/api/content/posts/"
-            
-            headers = {
-                'Accept-Version': 'v5.0'
-            }
+            url = f"{self._content_api_url}/posts/"
             
             # Search for featured posts in last 7 days
             featured_params = {
@@ -797,11 +1168,11 @@ class GhostNewsletterSender:
             }
             
             print("🔍 Looking for featured posts in the last 7 days...")
-            featured_response = requests.get(url, headers=headers, params=featured_params)
+            featured_response = self.session.get(url, params=featured_params, timeout=self.HTTP_TIMEOUT)
             featured_post = None
             
             if featured_response.status_code == 200:
-                featured_data = featured_response.json()
+                featured_data = self._json(featured_response)
                 featured_posts = featured_data.get('posts', [])
                 if featured_posts:
                     # Apply filtering to featured posts
@@ -820,16 +1191,16 @@ class GhostNewsletterSender:
                 'order': 'published_at desc',
                 'include': 'tags,authors',
                 'formats': 'html,plaintext',
-                'filter': f'published_at:>={regular_date_filter}'
+                'filter': self.build_posts_filter(regular_date_filter)
             }
             
-            response = requests.get(url, headers=headers, params=regular_params)
+            response = self.session.get(url, params=regular_params, timeout=self.HTTP_TIMEOUT)
             
             if response.status_code != 200:
                 print(f"Error fetching posts from Ghost API: {response.status_code} - {response.text}")
                 return []
             
-            data = response.json()
+            data = self._json(response)
             all_posts = data.get('posts', [])
             
             if not all_posts and not featured_post:
@@ -839,34 +1210,26 @@ class GhostNewsletterSender:
             # Get blog settings once to avoid multiple API calls during image enhancement
             blog_settings = self.get_blog_settings_from_ghost()
             
-            # Apply filtering to all posts
-            all_posts = self.filter_posts_by_criteria(all_posts)
-            all_posts = self.enhance_post_images(all_posts, blog_settings)
-            
-            # Build final post list
-            final_posts = []
-            
             # If we have a featured post, it goes first
             if featured_post:
                 # Enhance the featured post image
                 featured_post = self.enhance_post_images([featured_post], blog_settings)[0]
-                final_posts.append(featured_post)
-                featured_post_id = featured_post.get('id')
                 
-                # Add other posts, excluding the featured post
-                for post in all_posts:
-                    if post.get('id') != featured_post_id and len(final_posts) < max_posts:
-                        final_posts.append(post)
+                # Fill the remaining slots with other posts, excluding the featured post
+                final_posts = [featured_post] + self._select_posts(
+                    all_posts, max_posts - 1, blog_settings, exclude_id=featured_post.get('id'))
             else:
                 # No featured post found, use regular ordering
-                final_posts = all_posts[:max_posts]
+                final_posts = self._select_posts(all_posts, max_posts, blog_settings)
             
             print(f"Found {len(final_posts)} posts for newsletter:")
-            for i, post in enumerate(final_posts):
-                tags = ', '.join([tag.get('name', '') for tag in post.get('tags', [])])
-                featured = " [FEATURED]" if post.get('featured') else ""
-                post_type = "Main post" if i == 0 else "Keep reading"
-                print(f"  - {post.get('title', 'Untitled')}{featured} (tags: {tags}) [{post_type}]")
+            if final_posts and log.isEnabledFor(logging.INFO):
+                log.info("\n".join(
+                    f"  - {post.get('title', 'Untitled')}{' [FEATURED]' if post.get('featured') else ''}"
+                    f" (tags: {', '.join(tag.get('name', '') for tag in post.get('tags', []))})"
+                    f" [{'Main post' if i == 0 else 'Keep reading'}]"
+                    for i, post in enumerate(final_posts)
+                ))
             
             return final_posts
             
@@ -887,17 +1250,11 @@ class GhostNewsletterSender:
                 print(f"🤖 Auto-detected interval: {days_back} days")
             
             # Calculate date filter for posts within the specified days
-            from datetime import datetime, timedelta
             cutoff_date = datetime.now() - timedelta(days=days_back)
             date_filter = cutoff_date.strftime('%Y-%m-%d')
             
             # Build the API URL
-            base_url = self.ghost_admin_url.replace('/ghost/api/admin', '')
-            url = f"{base_url}/ghost/api/content/posts/"
-            
-            headers = {
-                'Accept-Version': 'v5.0'
-            }
+            url = f"{self._content_api_url}/posts/"
             
             params = {
                 'key': self.ghost_content_api_key,
@@ -905,16 +1262,16 @@ class GhostNewsletterSender:
                 'order': 'published_at desc',
                 'include': 'tags,authors',
                 'formats': 'html,plaintext',
-                'filter': f'published_at:>={date_filter}'
+                'filter': self.build_posts_filter(date_filter)
             }
             
-            response = requests.get(url, headers=headers, params=params)
+            response = self.session.get(url, params=params, timeout=self.HTTP_TIMEOUT)
             
             if response.status_code != 200:
                 print(f"Error fetching posts from Ghost API: {response.status_code} - {response.text}")
                 return []
             
-            data = response.json()
+            data = self._json(response)
             posts = data.get('posts', [])
             
             if not posts:
@@ -924,18 +1281,16 @@ class GhostNewsletterSender:
             # Get blog settings once to avoid multiple API calls during image enhancement
             blog_settings = self.get_blog_settings_from_ghost()
             
-            # Apply advanced filtering
-            posts = self.filter_posts_by_criteria(posts)
-            posts = self.enhance_post_images(posts, blog_settings)
-            
-            # Limit to max_posts after filtering
-            posts = posts[:max_posts]
+            # Apply advanced filtering, enhancing only the posts that are kept
+            posts = self._select_posts(posts, max_posts, blog_settings)
             
             print(f"Found {len(posts)} posts from Ghost from the last {days_back} days (after filtering)")
-            for post in posts:
-                tags = ', '.join([tag.get('name', '') for tag in post.get('tags', [])])
-                featured = " [FEATURED]" if post.get('featured') else ""
-                print(f"  - {post.get('title', 'Untitled')}{featured} (tags: {tags})")
+            if posts and log.isEnabledFor(logging.INFO):
+                log.info("\n".join(
+                    f"  - {post.get('title', 'Untitled')}{' [FEATURED]' if post.get('featured') else ''}"
+                    f" (tags: {', '.join(tag.get('name', '') for tag in post.get('tags', []))})"
+                    for post in posts
+                ))
             
             return posts
             
@@ -950,78 +1305,64 @@ class GhostNewsletterSender:
 
     def render_conditional_template(self, template, data):
         """Render template with conditional blocks and loops"""
-        import re
-        
-        # Add default fallback values for missing data
-        defaults = {
-            'blog_title': 'Newsletter',
-            'newsletter_interval': 'weekly',
-            'newsletter_date': 'Recent',
-            'featured_title': 'Latest Updates',
-            'featured_content': '<p>Check out our latest content!</p>',
-            'featured_url': '#',
-            'posts': [],
-            'blog_logo': '',
-            'social_twitter_url': '',
-            'newsletter_archive_url': ''
-        }
+        # Nothing to render once no placeholders are left
+        if '{{' not in template:
+            return template
         
         # Merge data with defaults (data takes precedence)
-        template_data = {**defaults, **data}
+        template_data = {**self.TEMPLATE_DEFAULTS, **data}
+        
+        # Look up the nested sections the conditionals read once
+        posts = template_data.get('posts') or []
+        has_featured_image = bool(posts) and bool(posts[0].get('picture'))
+        newsletter = template_data.get('newsletter') or {}
+        newsletter_settings = newsletter.get('settings') or {}
+        email = template_data.get('email') or {}
         
         # Handle conditional blocks
-        conditionals = [
-            ('if_blog_logo', bool(template_data.get('blog_logo'))),
-            ('if_featured_post', len(template_data.get('posts', [])) > 0),
-            ('if_featured_image', len(template_data.get('posts', [])) > 0 and bool(template_data['posts'][0].get('picture'))),
-            ('if_no_featured_image', len(template_data.get('posts', [])) > 0 and not bool(template_data['posts'][0].get('picture'))),
-            ('if_featured_image_caption', bool(template_data.get('featured_image_caption'))),
-            ('if_featured_excerpt', bool(template_data.get('featured_excerpt'))),
-            ('if_additional_posts', len(template_data.get('posts', [])) > 1),
-            ('if_social_sharing', bool(template_data.get('social_twitter_url'))),
-            ('if_newsletter_archive', bool(template_data.get('newsletter_archive_url'))),
+        condition_values = {
+            'if_blog_logo': bool(template_data.get('blog_logo')),
+            'if_featured_post': len(posts) > 0,
+            'if_featured_image': has_featured_image,
+            'if_no_featured_image': bool(posts) and not has_featured_image,
+            'if_featured_image_caption': bool(template_data.get('featured_image_caption')),
+            'if_featured_excerpt': bool(template_data.get('featured_excerpt')),
+            'if_additional_posts': len(posts) > 1,
+            'if_social_sharing': bool(template_data.get('social_twitter_url')),
+            'if_newsletter_archive': bool(template_data.get('newsletter_archive_url')),
             # New newsletter-specific conditionals
-            ('newsletter.header_image', bool(template_data.get('newsletter', {}).get('header_image'))),
-            ('newsletter.settings.show_header_icon', template_data.get('newsletter', {}).get('settings', {}).get('show_header_icon', True)),
-            ('newsletter.settings.show_header_title', template_data.get('newsletter', {}).get('settings', {}).get('show_header_title', True)),
-            ('newsletter.settings.show_feature_image', template_data.get('newsletter', {}).get('settings', {}).get('show_feature_image', True)),
-            ('newsletter.settings.show_excerpt', template_data.get('newsletter', {}).get('settings', {}).get('show_excerpt', True)),
-            ('newsletter.settings.show_author', template_data.get('newsletter', {}).get('settings', {}).get('show_author', False)),
-            ('newsletter.settings.show_latest_posts', template_data.get('newsletter', {}).get('settings', {}).get('show_latest_posts', True)),
-            ('newsletter.settings.show_subscription_details', template_data.get('newsletter', {}).get('settings', {}).get('show_subscription_details', True)),
-            ('newsletter.settings.footer_content', bool(template_data.get('newsletter', {}).get('settings', {}).get('footer_content'))),
-            ('email.support_address', bool(template_data.get('email', {}).get('support_address'))),
-        ]
-        
-        rendered = template
-        
-        # Process each conditional
-        for condition_name, condition_value in conditionals:
-            # Pattern to match conditional blocks
-            pattern = r'{{#' + condition_name + r'}}(.*?){{/' + condition_name + r'}}'
-            
-            if condition_value:
-                # Keep the content, remove the conditional tags
-                rendered = re.sub(pattern, r'\1', rendered, flags=re.DOTALL)
-            else:
-                # Remove the entire conditional block
-                rendered = re.sub(pattern, '', rendered, flags=re.DOTALL)
+            'newsletter.header_image': bool(newsletter.get('header_image')),
+            'newsletter.settings.footer_content': bool(newsletter_settings.get('footer_content')),
+            'email.support_address': bool(email.get('support_address')),
+        }
+        for condition_name, setting_key, default in self.NEWSLETTER_SETTING_CONDITIONALS:
+            condition_values[condition_name] = newsletter_settings.get(setting_key, default)
         
-        # Replace template variables with fallback support
-        for key, value in template_data.items():
-            if key == 'posts':  # Skip the posts array used for conditionals
-                continue
-                
-            # Handle triple braces for raw HTML content first
-            if key in ['featured_content', 'additional_posts_content']:
-                placeholder = '{{{' + key + '}}}'
-                if placeholder in rendered:
-                    rendered = rendered.replace(placeholder, str(value) if value is not None else '')
-            
-            # Handle double braces for escaped content
-            placeholder = "{{" + key + "}}"
-            if placeholder in rendered:
-                rendered = rendered.replace(placeholder, str(value) if value is not None else '')
+        def resolve_conditional(match):
+            condition_name, content = match.groups()
+            # Resolve any blocks nested inside this one as well
+            content = self.CONDITIONAL_BLOCK_RE.sub(resolve_conditional, content)
+            if condition_name not in condition_values:
+                return f"{{{{#{condition_name}}}}}{content}{{{{/{condition_name}}}}}"
+            # Keep the content without the tags, or drop the whole block
+            return content if condition_values[condition_name] else ''
+        
+        # Process every conditional block in a single pass over the template
+        rendered = self.CONDITIONAL_BLOCK_RE.sub(resolve_conditional, template)
+        if '{{' not in rendered:
+            return rendered
+        
+        # Replace {{variables}} and raw {{{variables}}} in one pass, leaving unknown ones
+        def substitute_variable(match):
+            key = match.group(2)
+            if key == 'posts' or key not in template_data:  # posts is only used for conditionals
+                return match.group(0)
+            value = template_data[key]
+            return str(value) if value is not None else ''
+        
+        rendered = self.TEMPLATE_VARIABLE_RE.sub(substitute_variable, rendered)
+        if '{{' not in rendered:
+            return rendered
         
         # Clean up any remaining unresolved double-brace variables only (not triple braces)
         # This pattern specifically matches {{word}} but not {{{word}}}
@@ -1029,12 +1370,13 @@ class GhostNewsletterSender:
         def cleanup_placeholder(match):
             placeholder = match.group(0)
             # Preserve member-specific placeholders
-            if placeholder in ['{{member_name}}', '{{member_email}}', '{{member_created_at}}', '{{subscription_renewal_date}}', '{{manage_subscription_url}}']:
-                print(f"🔍 Preserving member placeholder in cleanup: {placeholder}")
+            if placeholder in self.MEMBER_PLACEHOLDERS:
+                if self.debug:
+                    log.debug("🔍 Preserving member placeholder in cleanup: %s", placeholder)
                 return placeholder
             return ''
         
-        rendered = re.sub(r'(?<!\{)\{\{[^{}]+\}\}(?!\})', cleanup_placeholder, rendered)
+        rendered = self.UNRESOLVED_VARIABLE_RE.sub(cleanup_placeholder, rendered)
         
         return rendered
 
@@ -1043,14 +1385,13 @@ class GhostNewsletterSender:
         if len(posts) <= 1:
             return ""
         
-        additional_posts_html = ""
-        additional_posts = posts[1:]  # Skip the featured post
+        additional_posts_html = []
         
-        for i, post in enumerate(additional_posts):
-            # Get post data safely
-            post_title = post.get('title', 'Untitled')
-            post_url = post.get('url', '#')
-            post_excerpt = post.get('excerpt', '')
+        for post in posts[1:]:  # Skip the featured post
+            # Get post data safely, escaped for use in HTML
+            post_url = html.escape(post.get('url') or '#')
+            post_title = html.escape(post.get('title') or 'Untitled')
+            post_excerpt = html.escape(post.get('excerpt') or '')
             
             # Get featured image - works with both processed and raw formats
             if 'picture' in post:
@@ -1058,49 +1399,28 @@ class GhostNewsletterSender:
             else:
                 featured_image = post.get('feature_image', '')
             
-            # Generate the post HTML using Ghost's exact structure
-            additional_posts_html += f'''
-                                            <table role="presentation" border="0" cellpadding="0" cellspacing="0" style="border-collapse: separate; mso-table-lspace: 0pt; mso-table-rspace: 0pt; width: 100%;" width="100%">
-                                                <tbody><tr>
-                                                    <td class="latest-post" style="font-family: Inter, -apple-system, BlinkMacSystemFont, avenir next, avenir, helvetica neue, helvetica, ubuntu, roboto, noto, segoe ui, arial, sans-serif; font-size: 18px; vertical-align: top; color: #15212A; padding: 16px 0; max-width: 600px;" valign="top">
-                                                        <table role="presentation" border="0" cellpadding="0" cellspacing="0" style="border-collapse: separate; mso-table-lspace: 0pt; mso-table-rspace: 0pt; width: 100%;" width="100%">
-                                                            <tbody><tr>
-                                                                <td valign="top" align="left" class="latest-post-title" style="font-family: Inter, -apple-system, BlinkMacSystemFont, avenir next, avenir, helvetica neue, helvetica, ubuntu, roboto, noto, segoe ui, arial, sans-serif; font-size: 18px; vertical-align: top; color: #15212A; padding-right: 12px;">
-                                                                    <h4 class="" style="margin-top: 0; font-family: Inter, -apple-system, BlinkMacSystemFont, avenir next, avenir, helvetica neue, helvetica, ubuntu, roboto, noto, segoe ui, arial, sans-serif; text-rendering: optimizeLegibility; line-height: 1.2em; margin: 0; padding: 2px 0 4px; font-size: 18px; font-weight: 700; color: #15212A;">
-                                                                        <a href="{post_url}" style="overflow-wrap: anywhere; text-decoration: none; color: #15212A;" target="_blank">{post_title}</a>
-                                                                    </h4>
-                                                                        <p class="latest-post-excerpt" style="line-height: 1.6em; margin: 0; padding: 0; font-size: 15px; font-weight: 400; color: #15212a; color: rgba(0, 0, 0, 0.6);">
-                                                                            <a href="{post_url}" style="overflow-wrap: anywhere; text-decoration: none; color: #15212a; color: rgba(0, 0, 0, 0.6);" target="_blank">{post_excerpt}</a>
-                                                                        </p>
-                                                                </td>'''
-            
             # Add image column if featured image exists
+            image_cell = ''
             if featured_image:
-                additional_posts_html += f'''
-                                                                        <td width="100" class="latest-post-img" style="font-family: Inter, -apple-system, BlinkMacSystemFont, avenir next, avenir, helvetica neue, helvetica, ubuntu, roboto, noto, segoe ui, arial, sans-serif; font-size: 18px; vertical-align: top; color: #15212A;" valign="top">
-                                                                            <a href="{post_url}" style="overflow-wrap: anywhere; display: block; height: 100px; overflow: hidden; color: inherit; text-decoration: none;" target="_blank">
-                                                                                <img src="{featured_image}" width="100" height="100" style="border: none; -ms-interpolation-mode: bicubic; max-width: 100%; object-fit: cover;">
-                                                                            </a>
-                                                                        </td>'''
+                image_cell = ADDITIONAL_POST_IMAGE_HTML.format(url=post_url, image=html.escape(featured_image))
             
-            # Close the row and table
-            additional_posts_html += '''
-                                                            </tr>
-                                                        </tbody></table>
-                                                    </td>
-                                                </tr>
-                                            </tbody></table>'''
+            additional_posts_html.append(ADDITIONAL_POST_HTML.format(
+                url=post_url, title=post_title, excerpt=post_excerpt, image_cell=image_cell
+            ))
         
-        return additional_posts_html
+        return "".join(additional_posts_html)
 
     def load_template(self):
         """Load and return the HTML email template"""
         try:
-            script_dir = os.path.dirname(os.path.realpath(__file__))
-            template_path = os.path.join(script_dir, 'templates', 'ghost', 'newsletter_ghost_native.html')
-            
-            with open(template_path, 'r', encoding='utf-8') as file:
-                return file.read()
+            mtime = os.path.getmtime(self._template_path)
+            if self._template_cache is not None and mtime == self._template_mtime:
+                return self._template_cache
+            
+            with open(self._template_path, 'r', encoding='utf-8') as file:
+                self._template_cache = file.read()
+            self._template_mtime = mtime
+            return self._template_cache
                 
         except Exception as e:
             print(f"Error loading Ghost native template: {e}")
@@ -1125,14 +1445,17 @@ class GhostNewsletterSender:
                 first_tag = tags[0].get('name') if tags else 'General'
                 first_author = authors[0].get('name') if authors else self.from_name
                 
+                raw_html = post.get('html', '')
+                plaintext = post.get('plaintext', '')
+                
                 # Generate excerpt - use Ghost's excerpt or create from plaintext
                 excerpt = post.get('excerpt', '')
-                if not excerpt and post.get('plaintext'):
-                    excerpt = post.get('plaintext', '')[:200] + '...' if len(post.get('plaintext', '')) > 200 else post.get('plaintext', '')
+                if not excerpt and plaintext:
+                    excerpt = plaintext[:200] + '...' if len(plaintext) > 200 else plaintext
                 
                 # Process content for featured post (first post gets full HTML, others get excerpt)
                 if i == 0:  # Featured post
-                    content = self.process_content(post.get('html', ''))
+                    content = self.process_content(raw_html, add_utm=bool(post_url))
                 else:  # Regular posts get excerpt only
                     content = excerpt
                 
@@ -1145,8 +1468,8 @@ class GhostNewsletterSender:
                     'picture': post.get('feature_image', ''),
                     'excerpt': excerpt,
                     'published_at': post.get('published_at', ''),
-                    'raw_html': post.get('html', ''),
-                    'plaintext': post.get('plaintext', '')
+                    'raw_html': raw_html,
+                    'plaintext': plaintext
                 }
                 
                 processed_posts.append(processed_post)
@@ -1224,16 +1547,7 @@ class GhostNewsletterSender:
                 print(f"  • Background: {newsletter_settings.get('background_color')}")
             
             # Generate newsletter date
-            now = datetime.now()
-            if newsletter_interval.lower() == 'weekly':
-                # For weekly, show week start date
-                days_since_monday = now.weekday()
-                week_start = now - timedelta(days=days_since_monday)
-                formatted_date = week_start.strftime("%B %d, %Y")
-            elif newsletter_interval.lower() == 'monthly':
-                formatted_date = now.strftime("%B %Y")
-            else:  # daily
-                formatted_date = now.strftime("%B %d, %Y")
+            formatted_date = format_newsletter_date(newsletter_interval.lower(), datetime.now().toordinal())
             
             # Build newsletter data structure matching original.html expectations
             newsletter_data = {
@@ -1282,71 +1596,66 @@ class GhostNewsletterSender:
             print(f"Error generating newsletter data: {e}")
             return None
 
-    def process_content(self, content):
-        """Process HTML content for email compatibility"""
+    def process_content(self, content, add_utm=False):
+        """Process HTML content for email compatibility, optionally adding UTM tags to links"""
+        # Imported here so commands that never parse HTML don't pay for bs4
+        from bs4 import BeautifulSoup, Comment
+        
         try:
-            soup = BeautifulSoup(content, 'html.parser')
-            
-            # Style paragraphs
-            p_style = "font-family: Inter, -apple-system, BlinkMacSystemFont, avenir next, avenir, helvetica neue, helvetica, ubuntu, roboto, noto, segoe ui, arial, sans-serif; font-size: 18px; font-weight: normal; margin: 0 0 16px 0; line-height: 1.6; color: #495057;"
-            
-            for p_tag in soup.find_all('p'):
-                p_tag['style'] = p_style
-            
-            # Style images
-            for img_tag in soup.find_all('img'):
-                img_tag['style'] = "width: 100%; height: auto; border-radius: 4px; margin: 16px 0;"
-                img_tag.attrs.pop('width', None)
-                img_tag.attrs.pop('height', None)
-            
-            # Style headings
-            heading_sizes = [32, 26, 21, 19, 17, 15]  # Match Ghost's responsive font sizes
-            for i, h_tag in enumerate(['h1', 'h2', 'h3', 'h4', 'h5', 'h6']):
-                font_size = heading_sizes[i]
-                h_style = f"font-family: Inter, -apple-system, BlinkMacSystemFont, avenir next, avenir, helvetica neue, helvetica, ubuntu, roboto, noto, segoe ui, arial, sans-serif; font-size: {font_size}px; font-weight: 700; margin: 24px 0 16px 0; line-height: 1.3; color: #2c3e50;"
-                
-                for heading in soup.find_all(h_tag):
-                    heading['style'] = h_style
-            
-            # Style links
-            for a_tag in soup.find_all('a'):
-                a_tag['style'] = "color: #007bff; text-decoration: none; font-weight: 500;"
-            
-            # Style lists (ul/ol) and list items (li)
-            ul_style = "font-family: Inter, -apple-system, BlinkMacSystemFont, avenir next, avenir, helvetica neue, helvetica, ubuntu, roboto, noto, segoe ui, arial, sans-serif; margin: 16px 0; padding-left: 20px; color: #495057;"
-            li_style = "font-family: Inter, -apple-system, BlinkMacSystemFont, avenir next, avenir, helvetica neue, helvetica, ubuntu, roboto, noto, segoe ui, arial, sans-serif; font-size: 18px; font-weight: normal; margin: 0 0 8px 0; line-height: 1.6; color: #495057;"
-            
-            for ul_tag in soup.find_all(['ul', 'ol']):
-                ul_tag['style'] = ul_style
+            soup = BeautifulSoup(content, 'lxml')
+            utm_tags = self.build_utm_tags() if add_utm and self.website_domain else None
+            
+            # Style every element in a single traversal; cards are collected and rebuilt afterwards
+            blockquotes = []
+            bookmark_cards = []
+            callout_cards = []
+            callout_texts = {}
+            for tag in soup.find_all(True):
+                name = tag.name
+                style = self.CONTENT_TAG_STYLES.get(name)
+                if style is not None:
+                    tag['style'] = style
                 
-            for li_tag in soup.find_all('li'):
-                li_tag['style'] = li_style
-            
-            # Style blockquotes
-            for blockquote in soup.find_all('blockquote'):
-                blockquote['style'] = "font-family: Inter, -apple-system, BlinkMacSystemFont, avenir next, avenir, helvetica neue, helvetica, ubuntu, roboto, noto, segoe ui, arial, sans-serif; font-size: 18px; font-style: italic; margin: 24px 0; padding: 20px 24px; background-color: #f8f9fa; border-left: 4px solid #dee2e6; line-height: 1.6; color: #495057; border-radius: 0 6px 6px 0;"
-                
-                # Style paragraphs within blockquotes differently
+                if name == 'img':
+                    tag.attrs.pop('width', None)
+                    tag.attrs.pop('height', None)
+                elif name == 'a':
+                    # Bookmark cards pick up the tagged href when they are rebuilt below
+                    if utm_tags and tag.get('href') is not None:
+                        tag['href'] = self.add_utm_to_href(tag['href'], utm_tags)
+                elif name == 'blockquote':
+                    blockquotes.append(tag)
+                elif name == 'figcaption':
+                    # Style any span elements within figcaption (Ghost often wraps caption text in spans)
+                    for span in tag.find_all('span'):
+                        # Preserve any existing styling but ensure text wrapping
+                        existing_style = span.get('style', '')
+                        if 'white-space: pre-wrap' in existing_style:
+                            # Clean up the existing style and add display block
+                            cleaned_style = existing_style.replace('white-space: pre-wrap', 'white-space: pre-wrap; display: block; word-wrap: break-word')
+                            span['style'] = cleaned_style
+                        else:
+                            span['style'] = "display: block; word-wrap: break-word;"
+                elif name == 'figure' and 'kg-bookmark-card' in tag.get('class', []):
+                    bookmark_cards.append(tag)
+                elif name == 'div':
+                    classes = tag.get('class', [])
+                    if 'kg-callout-card' in classes:
+                        callout_cards.append(tag)
+                    elif 'kg-callout-text' in classes:
+                        # Pair the text with every enclosing card that has none yet (the first one in document order)
+                        for parent in tag.parents:
+                            if parent.name == 'div' and 'kg-callout-card' in parent.get('class', []):
+                                callout_texts.setdefault(id(parent), tag)
+            
+            # Style paragraphs within blockquotes differently, after the general paragraph style
+            for blockquote in blockquotes:
                 for p in blockquote.find_all('p'):
                     p['style'] = "font-family: Inter, -apple-system, BlinkMacSystemFont, avenir next, avenir, helvetica neue, helvetica, ubuntu, roboto, noto, segoe ui, arial, sans-serif; font-size: 18px; font-style: italic; margin: 0 0 12px 0; line-height: 1.6; color: #495057;"
             
-            # Style figure captions
-            for figcaption in soup.find_all('figcaption'):
-                figcaption['style'] = "font-family: Inter, -apple-system, BlinkMacSystemFont, avenir next, avenir, helvetica neue, helvetica, ubuntu, roboto, noto, segoe ui, arial, sans-serif; font-size: 14px; color: #738a94; text-align: center; margin: 8px 0 16px 0; line-height: 1.4; font-style: italic;"
-                
-                # Style any span elements within figcaption (Ghost often wraps caption text in spans)
-                for span in figcaption.find_all('span'):
-                    # Preserve any existing styling but ensure text wrapping
-                    existing_style = span.get('style', '')
-                    if 'white-space: pre-wrap' in existing_style:
-                        # Clean up the existing style and add display block
-                        cleaned_style = existing_style.replace('white-space: pre-wrap', 'white-space: pre-wrap; display: block; word-wrap: break-word')
-                        span['style'] = cleaned_style
-                    else:
-                        span['style'] = "display: block; word-wrap: break-word;"
-            
             # Style bookmark cards
-            for bookmark_card in soup.find_all('figure', class_='kg-bookmark-card'):
+            bookmark_html = []
+            for bookmark_card in bookmark_cards:
                 # Create new email-compatible structure
                 bookmark_link = bookmark_card.find('a', class_='kg-bookmark-container')
                 if bookmark_link:
@@ -1371,116 +1680,37 @@ class GhostNewsletterSender:
                         if thumbnail_img:
                             thumbnail_src = thumbnail_img.get('src', '')
                     
-                    # Create email-compatible bookmark card
-                    email_bookmark = soup.new_tag('table')
-                    email_bookmark['style'] = "width: 100%; max-width: 600px; margin: 24px 0; border: 1px solid #e0e7eb; border-radius: 8px; overflow: hidden; background-color: #ffffff;"
-                    email_bookmark['cellpadding'] = "0"
-                    email_bookmark['cellspacing'] = "0"
-                    email_bookmark['border'] = "0"
-                    
-                    # Create main row
-                    main_row = soup.new_tag('tr')
-                    
-                    # Content cell
-                    content_cell = soup.new_tag('td')
-                    content_cell['style'] = "padding: 20px; vertical-align: top;"
-                    
-                    # Title
-                    title_div = soup.new_tag('div')
-                    title_div['style'] = "font-family: Inter, -apple-system, BlinkMacSystemFont, Roboto, Helvetica, Arial, sans-serif; font-size: 16px; font-weight: 600; color: #15212A; margin-bottom: 8px; line-height: 1.4;"
-                    title_div.string = title
-                    content_cell.append(title_div)
-                    
-                    # Description
-                    if description:
-                        desc_div = soup.new_tag('div')
-                        desc_div['style'] = "font-family: Inter, -apple-system, BlinkMacSystemFont, Roboto, Helvetica, Arial, sans-serif; font-size: 14px; color: #738a94; margin-bottom: 12px; line-height: 1.5; overflow: hidden; display: -webkit-box; -webkit-line-clamp: 2; -webkit-box-orient: vertical;"
-                        desc_div.string = description[:150] + '...' if len(description) > 150 else description
-                        content_cell.append(desc_div)
-                    
-                    # Metadata with icon and author
+                    # Render the email-compatible card after serialization; leave a marker in its place
+                    description = description[:150] + '...' if len(description) > 150 else description
+                    meta_html = ''
                     if icon_src or author:
-                        meta_div = soup.new_tag('div')
-                        meta_div['style'] = "display: flex; align-items: center; font-family: Inter, -apple-system, BlinkMacSystemFont, Roboto, Helvetica, Arial, sans-serif; font-size: 13px; color: #738a94;"
-                        
-                        if icon_src:
-                            icon_img = soup.new_tag('img')
-                            icon_img['src'] = icon_src
-                            icon_img['alt'] = ''
-                            icon_img['style'] = "width: 16px; height: 16px; margin-right: 8px; border-radius: 2px;"
-                            meta_div.append(icon_img)
-                        
-                        if author:
-                            author_span = soup.new_tag('span')
-                            author_span.string = author
-                            meta_div.append(author_span)
-                        
-                        content_cell.append(meta_div)
-                    
-                    main_row.append(content_cell)
-                    
-                    # Thumbnail cell (if available)
-                    if thumbnail_src:
-                        thumbnail_cell = soup.new_tag('td')
-                        thumbnail_cell['style'] = "width: 120px; padding: 20px 20px 20px 0; vertical-align: top;"
-                        
-                        thumbnail_img = soup.new_tag('img')
-                        thumbnail_img['src'] = thumbnail_src
-                        thumbnail_img['alt'] = ''
-                        thumbnail_img['style'] = "width: 120px; height: 80px; object-fit: cover; border-radius: 4px;"
-                        
-                        thumbnail_cell.append(thumbnail_img)
-                        main_row.append(thumbnail_cell)
-                    
-                    email_bookmark.append(main_row)
-                    
-                    # Wrap in link
-                    link_wrapper = soup.new_tag('a')
-                    link_wrapper['href'] = href
-                    link_wrapper['style'] = "text-decoration: none; color: inherit; display: block;"
-                    link_wrapper['target'] = '_blank'
-                    link_wrapper.append(email_bookmark)
-                    
-                    # Replace the original bookmark card
-                    bookmark_card.replace_with(link_wrapper)
+                        meta_html = BOOKMARK_META_HTML.format(
+                            icon=BOOKMARK_ICON_HTML.format(src=html.escape(icon_src)) if icon_src else '',
+                            author=f"<span>{html.escape(author, quote=False)}</span>" if author else ''
+                        )
+                    bookmark_html.append(BOOKMARK_CARD_HTML.format(
+                        href=html.escape(href),
+                        title=html.escape(title, quote=False),
+                        description=BOOKMARK_DESCRIPTION_HTML.format(text=html.escape(description, quote=False)) if description else '',
+                        meta=meta_html,
+                        thumbnail=BOOKMARK_THUMBNAIL_HTML.format(src=html.escape(thumbnail_src)) if thumbnail_src else ''
+                    ))
+                    bookmark_card.replace_with(BOOKMARK_MARKER)
             
             # Style callout cards
-            for callout_card in soup.find_all('div', class_='kg-callout-card'):
-                # Determine callout type and set appropriate background color
-                callout_type = 'grey'  # default
-                if 'kg-callout-card-blue' in callout_card.get('class', []):
-                    callout_type = 'blue'
-                elif 'kg-callout-card-green' in callout_card.get('class', []):
-                    callout_type = 'green'
-                elif 'kg-callout-card-yellow' in callout_card.get('class', []):
-                    callout_type = 'yellow'
-                elif 'kg-callout-card-red' in callout_card.get('class', []):
-                    callout_type = 'red'
-                elif 'kg-callout-card-pink' in callout_card.get('class', []):
-                    callout_type = 'pink'
-                elif 'kg-callout-card-purple' in callout_card.get('class', []):
-                    callout_type = 'purple'
-                
-                # Define color schemes for different callout types
-                color_schemes = {
-                    'grey': {'bg': '#f8f9fa', 'border': '#e9ecef', 'text': '#495057'},
-                    'blue': {'bg': '#e7f3ff', 'border': '#b3d9ff', 'text': '#0c5aa6'},
-                    'green': {'bg': '#e8f5e8', 'border': '#c3e6c3', 'text': '#0f5132'},
-                    'yellow': {'bg': '#fff3cd', 'border': '#ffd60a', 'text': '#664d03'},
-                    'red': {'bg': '#f8d7da', 'border': '#f5c2c7', 'text': '#721c24'},
-                    'pink': {'bg': '#f3e2f3', 'border': '#e1bee7', 'text': '#7b1fa2'},
-                    'purple': {'bg': '#e1e7ff', 'border': '#c5d1ff', 'text': '#4c1d95'}
-                }
-                
-                colors = color_schemes.get(callout_type, color_schemes['grey'])
+            for callout_card in callout_cards:
+                # Determine callout type from its class, defaulting to grey
+                classes = callout_card.get('class', [])
+                callout_type = next((t for cls, t in self.CALLOUT_CLASS_TYPES if cls in classes), 'grey')
+                styles = self.CALLOUT_STYLES[callout_type]
                 
                 # Apply email-compatible styling to the callout card
-                callout_card['style'] = f"background-color: {colors['bg']}; border: 1px solid {colors['border']}; border-radius: 6px; padding: 16px 20px; margin: 24px 0; font-family: Inter, -apple-system, BlinkMacSystemFont, Roboto, Helvetica, Arial, sans-serif;"
+                callout_card['style'] = styles['card']
                 
                 # Style the callout text content
-                callout_text = callout_card.find('div', class_='kg-callout-text')
+                callout_text = callout_texts.get(id(callout_card))
                 if callout_text:
-                    callout_text['style'] = f"color: {colors['text']}; font-size: 16px; line-height: 1.5; margin: 0;"
+                    callout_text['style'] = styles['text']
                     
                     # Style any nested elements within the callout text
                     for elem in callout_text.find_all(['i', 'em', 'strong', 'b']):
@@ -1488,57 +1718,78 @@ class GhostNewsletterSender:
                         # Preserve existing style but ensure proper text wrapping
                         if 'white-space: pre-wrap' in existing_style:
                             # Clean up the existing style and add color and display properties
-                            cleaned_style = existing_style.replace('white-space: pre-wrap', f'white-space: pre-wrap; color: {colors["text"]}; display: block; word-wrap: break-word')
+                            cleaned_style = existing_style.replace('white-space: pre-wrap', styles['pre_wrap'])
                             elem['style'] = cleaned_style
                         else:
-                            elem['style'] = f"color: {colors['text']}; word-wrap: break-word;"
+                            elem['style'] = styles['inline']
             
             # Return the inner HTML content without wrapping tags
             if soup.body:
-                return str(soup.body.decode_contents())
+                # lxml hoists comments ahead of the first element (Ghost's <!--kg-card-begin: html-->) out of <body>
+                leading_comments = ''.join(
+                    node.output_ready() for node in soup.contents
+                    if isinstance(node, Comment) and node.find_next_sibling('html')
+                )
+                processed = leading_comments + str(soup.body.decode_contents())
             else:
-                return str(soup)
+                processed = str(soup)
+            
+            # Swap the bookmark markers for their rendered cards, in document order
+            if bookmark_html:
+                pieces = processed.split(BOOKMARK_MARKER)
+                processed = pieces[0] + ''.join(card + piece for card, piece in zip(bookmark_html, pieces[1:]))
+            
+            return processed
             
         except Exception as e:
             print(f"Error processing content: {e}")
             return content
 
-    def add_utm_tags(self, content, post_url):
-        """Add UTM tracking tags to all links"""
+    def build_utm_tags(self):
+        """Build the UTM query string for this week's newsletter links"""
+        campaign = datetime.now().strftime("%y%U")
+        cached_campaign, utm_tags = self._utm_tags_cache
+        if campaign != cached_campaign:
+            utm_tags = f"?utm_source={self.website_domain}&utm_medium=email&utm_campaign=newsletter-{campaign}"
+            self._utm_tags_cache = (campaign, utm_tags)
+        return utm_tags
+
+    def add_utm_to_href(self, href, utm_tags):
+        """Append UTM tags to a single link, leaving other domains untouched"""
+        # WEBSITE_DOMAIN is optional; without it there is no utm_source, so links stay as they are
+        if not self.website_domain:
+            return href
+        
+        parts = urlsplit(href)
+        
+        # Skip non-web links (mailto:, tel:) and full URLs from a different domain
+        if parts.scheme and parts.scheme not in ('http', 'https'):
+            return href
+        if parts.netloc and self.website_domain not in parts.netloc:
+            return href
+        
+        # Add UTM tags to the query, keeping any fragment after it
+        utm_query = utm_tags.lstrip('?')
+        query = f"{parts.query}&{utm_query}" if parts.query else utm_query
+        return urlunsplit(parts._replace(query=query))
+
+    def add_utm_tags(self, content, post_url, utm_tags=None):
+        """Add UTM tracking tags to every <a href> in HTML that process_content won't see"""
+        # process_content tags links during its own traversal; this shares add_utm_to_href with it
+        utm_tags = utm_tags or self.build_utm_tags()
+        
+        def rewrite(match):
+            quote = match.group(2)
+            href = self.add_utm_to_href(html.unescape(match.group(3)), utm_tags)
+            return match.group(1) + quote + html.escape(href) + quote
+        
         try:
-            soup = BeautifulSoup(content, 'html.parser')
-            
-            # Generate UTM tags
-            now = datetime.now()
-            week_number = now.strftime("%U")
-            year = now.strftime("%y")
-            utm_tags = f"?utm_source={self.website_domain}&utm_medium=email&utm_campaign=newsletter-{year}{week_number}"
-            
-            for a_tag in soup.find_all('a', href=True):
-                href = a_tag['href']
-                
-                # Skip if it's already a full URL from a different domain
-                if href.startswith('http') and self.website_domain not in href:
-                    continue
-                
-                # Add UTM tags
-                if "?" in href:
-                    href += "&" + utm_tags.lstrip('?')
-                elif "#" in href:
-                    href_parts = href.split("#", 1)
-                    href = href_parts[0] + utm_tags + "#" + href_parts[1]
-                else:
-                    href += utm_tags
-                
-                a_tag['href'] = href
-            
-            return str(soup)
-            
+            return self.ANCHOR_HREF_RE.sub(rewrite, content)
         except Exception as e:
             print(f"Error adding UTM tags: {e}")
             return content
 
-    def generate_unsubscribe_link(self, email):
+    def generate_unsubscribe_link(self, email=None):
         """Generate unsubscribe link for the email using Ghost portal"""
         try:
             # Use Ghost's built-in portal unsubscribe system
@@ -1559,11 +1810,6 @@ class GhostNewsletterSender:
     def render_newsletter_template(self, template, newsletter_data):
         """Render the email template with newsletter data using the new template system"""
         try:
-            # Process content with UTM tags for all posts
-            for post in newsletter_data['blog']['post']:
-                if post['url']:
-                    post['text'] = self.add_utm_tags(post['text'], post['url'])
-            
             # Prepare template data
             posts = newsletter_data['blog']['post']
             featured_post = posts[0] if posts else {}
@@ -1666,209 +1912,108 @@ class GhostNewsletterSender:
             rendered = self.render_conditional_template(template, template_data)
             
             # Debug: Print template data structure
-            print(f"🐛 Template data keys: {list(template_data.keys())}")
-            if 'newsletter' in template_data:
-                print(f"🐛 Newsletter data: {template_data['newsletter']}")
-            if 'blog' in template_data:
-                print(f"🐛 Blog data: {template_data['blog']}")
-            if 'email' in template_data:
-                print(f"🐛 Email data: {template_data['email']}")
+            if self.debug:
+                log.debug("🐛 Template data keys: %s", list(template_data))
+                log.debug("🐛 Newsletter data: %s", template_data['newsletter'])
+                log.debug("🐛 Blog data: %s", template_data['blog'])
+                log.debug("🐛 Email data: %s", template_data['email'])
             
             # Helper function to handle nested object references
-            def replace_nested_template_vars(text, data, prefix=''):
+            def replace_nested_template_vars(text, data):
                 """Replace template variables including nested objects"""
-                import re
-                
-                # Member-specific variables to exclude from template replacement
-                member_specific_vars = ['member_name', 'member_email', 'member_created_at', 'subscription_renewal_date']
-                
-                # Handle simple conditionals first ({{#if variable}})
-                if_pattern = r'\{\{#if\s+([^}]+)\}\}(.*?)\{\{/if\}\}'
-                
-                def process_conditional(match):
-                    condition = match.group(1).strip()
-                    content = match.group(2)
-                    
-                    # Evaluate condition from nested data
-                    value = get_nested_value(data, condition)
-                    return content if value else ''
-                
-                # Replace conditionals
-                text = re.sub(if_pattern, process_conditional, text, flags=re.DOTALL)
+                # Handle simple conditionals first ({{#if variable}}); conditions are read from the
+                # nested sections only, so top-level dotted keys never decide a block
+                conditions = self.flatten_template_data({key: value for key, value in data.items() if '.' not in key}, raw=True)
+                text = self.TEMPLATE_IF_RE.sub(lambda match: match.group(2) if conditions.get(match.group(1).strip()) else '', text)
                 
                 # Handle nested object references like {{blog.title}}, {{newsletter.settings.show_header_icon}}
-                for key, value in data.items():
-                    current_path = f"{prefix}.{key}" if prefix else key
-                    
-                    # Skip member-specific variables that are placeholder strings
-                    if current_path in member_specific_vars and isinstance(value, str) and value.startswith('{{') and value.endswith('}}'):
-                        print(f"🔍 Preserving member placeholder: {current_path} = {value}")
-                        continue
-                    
-                    if isinstance(value, dict):
-                        # Recursively handle nested objects
-                        text = replace_nested_template_vars(text, value, current_path)
-                    else:
-                        # Replace the template variable
-                        placeholder = '{{' + current_path + '}}'
-                        if placeholder in ['{{member_name}}', '{{member_email}}', '{{member_created_at}}', '{{subscription_renewal_date}}']:
-                            print(f"🚨 WARNING: About to replace member variable {placeholder}")
-                        text = text.replace(placeholder, str(value) if value is not None else '')
-                
-                return text
-            
-            def get_nested_value(data, path):
-                """Get value from nested object using dot notation"""
-                try:
-                    keys = path.split('.')
-                    value = data
-                    for key in keys:
-                        if isinstance(value, dict) and key in value:
-                            value = value[key]
-                        else:
-                            return False
-                    return bool(value) if value is not None else False
-                except:
-                    return False
+                # with one lookup per placeholder; member placeholders map to themselves
+                lookup = self.flatten_template_data(data)
+                return self.NESTED_VARIABLE_RE.sub(lambda match: lookup.get(match.group(1), match.group(0)), text)
             
             # Replace nested template variables
             rendered = replace_nested_template_vars(rendered, template_data)
             
             # Debug: Check if key variables were replaced
-            if 'https://brunoamaral.eu/content/images/2025/08/IMG_8250-4.jpeg' in rendered:
-                print("✅ Header image was successfully replaced")
-            else:
-                print("❌ Header image replacement failed")
-                # Check if the placeholder is still there
-                if '{{newsletter.header_image}}' in rendered:
-                    print("🐛 Template still contains: {{newsletter.header_image}}")
-            
-            if 'bruno-1.png' in rendered:
-                print("✅ Blog icon was successfully replaced")
-            else:
-                print("❌ Blog icon replacement failed")
-                if '{{blog.icon}}' in rendered:
-                    print("🐛 Template still contains: {{blog.icon}}")
+            if self.debug:
+                for placeholder in ('{{newsletter.header_image}}', '{{blog.icon}}'):
+                    if placeholder in rendered:
+                        log.debug("🐛 Template still contains: %s", placeholder)
+                    else:
+                        log.debug("✅ %s was replaced", placeholder)
             
             # Replace template variables (legacy compatibility)
-            member_specific_vars = ['member_name', 'member_email', 'member_created_at', 'subscription_renewal_date']
-            
-            for key, value in template_data.items():
-                if key == 'posts':  # Skip the posts array used for conditionals
-                    continue
-                if isinstance(value, dict):  # Skip nested objects (already handled above)
-                    continue
-                if key in member_specific_vars and isinstance(value, str) and value.startswith('{{') and value.endswith('}}'):
-                    # Skip member-specific variables that are placeholder strings
-                    print(f"🔍 Preserving member placeholder in template loop: {key} = {value}")
-                    continue
-                    
-                if key in ['featured_content', 'additional_posts_content']:
-                    # Handle triple braces for raw HTML content
-                    placeholder = '{{{' + key + '}}}'
-                    rendered = rendered.replace(placeholder, str(value) if value else '')
-                else:
-                    # Handle double braces for escaped content
-                    placeholder = '{{' + key + '}}'
-                    if placeholder in ['{{member_name}}', '{{member_email}}', '{{member_created_at}}', '{{subscription_renewal_date}}']:
-                        print(f"🚨 WARNING: About to replace member placeholder {placeholder} in template loop")
-                    rendered = rendered.replace(placeholder, str(value) if value else '')
+            rendered = self.replace_template_variables(rendered, template_data)
             
             return rendered
             
         except Exception as e:
-            print(f"Error rendering newsletter template: {e}")
-            import traceback
-            traceback.print_exc()
+            log.exception("Error rendering newsletter template: %s", e)
             return None
 
+    @staticmethod
+    def flatten_template_data(data, raw=False):
+        """Map dotted paths like 'blog.title' to string values for every non-dict leaf, or to raw values and sections if raw"""
+        flat = {}
+        stack = [('', data)]
+        while stack:
+            prefix, section = stack.pop()
+            for key, value in section.items():
+                path = f"{prefix}.{key}" if prefix else key
+                if isinstance(value, dict):
+                    if raw:
+                        flat[path] = value
+                    stack.append((path, value))
+                elif raw:
+                    flat[path] = value
+                else:
+                    flat[path] = str(value) if value is not None else ''
+        return flat
+
     def personalize_newsletter_for_member(self, email_content, member):
         """Personalize newsletter content with specific member data"""
         try:
-            # Debug: Check if placeholders exist before replacement
-            if '{{member_name}}' in email_content:
-                print("✅ {{member_name}} placeholder found in content")
-            else:
-                print("❌ {{member_name}} placeholder NOT found in content")
-                
-            # Check what's around the Name field before replacement
-            name_pos = email_content.find('<strong>Name:</strong>')
-            if name_pos != -1:
-                start = max(0, name_pos - 20)
-                end = min(len(email_content), name_pos + 80)
-                context = email_content[start:end]
-                print(f"🔍 BEFORE replacement: {repr(context)}")
-            
-            # Format member creation date
+            # Format member creation date and subscription renewal date (1 year from creation)
             member_created_at = member.get('created_at', '')
+            formatted_date = member_created_at or 'Unknown'
+            renewal_date = 'N/A'
             if member_created_at:
-                from datetime import datetime
                 try:
                     # Parse ISO format from Ghost API
                     created_date = datetime.fromisoformat(member_created_at.replace('Z', '+00:00'))
                     formatted_date = created_date.strftime('%d %B %Y')
-                except:
-                    formatted_date = member_created_at
-            else:
-                formatted_date = 'Unknown'
-            
-            # Calculate subscription renewal date (1 year from creation)
-            renewal_date = 'N/A'
-            if member_created_at:
-                try:
-                    created_date = datetime.fromisoformat(member_created_at.replace('Z', '+00:00'))
-                    renewal_date_obj = created_date.replace(year=created_date.year + 1)
-                    renewal_date = renewal_date_obj.strftime('%d %b %Y')
+                    renewal_date = created_date.replace(year=created_date.year + 1).strftime('%d %b %Y')
                 except:
                     pass
             
-            # Replace member-specific placeholders
-            personalized_content = email_content
-            member_name = member.get('name', 'Subscriber')
-            member_email = member.get('email', '')
-            
-            print(f"🔍 Debug member data:")
-            print(f"   member_name type: {type(member_name)}")
-            print(f"   member_name repr: {repr(member_name)}")
-            print(f"   member_name length: {len(member_name) if member_name else 'None'}")
-            
-            personalized_content = personalized_content.replace('{{member_name}}', member_name)
-            personalized_content = personalized_content.replace('{{member_email}}', member_email)
-            personalized_content = personalized_content.replace('{{member_created_at}}', formatted_date)
-            personalized_content = personalized_content.replace('{{subscription_renewal_date}}', renewal_date)
-            
-            # Debug: Check the specific Name context after replacement
-            name_pos = personalized_content.find('<strong>Name:</strong>')
-            if name_pos != -1:
-                start = max(0, name_pos - 20)
-                end = min(len(personalized_content), name_pos + 80)
-                context = personalized_content[start:end]
-                print(f"🔍 Context after replacement: {repr(context)}")
-            else:
-                print("🔍 Could not find Name field in content")
-            
-            # Debug check: verify the replacement worked
-            print(f"🔍 Checking replacement for 'Name:' in content...")
-            name_context = ""
-            lines = personalized_content.split('\n')
-            for line in lines:
-                if 'Name:' in line:
-                    name_context = line.strip()
-                    print(f"🔍 Found Name line: '{name_context}'")
-                    break
-            
-            # Check if replacements were made
-            if '{{member_name}}' in personalized_content:
-                print("⚠️ Warning: {{member_name}} placeholder still exists in content")
-            else:
-                print("✅ {{member_name}} placeholder was replaced")
+            # Replace member-specific placeholders in a single pass over the rendered email
+            member_values = {
+                'member_name': member.get('name') or 'Subscriber',
+                'member_email': member.get('email') or '',
+                'member_created_at': formatted_date,
+                'subscription_renewal_date': renewal_date
+            }
+            personalized_content = self.MEMBER_VARIABLE_RE.sub(lambda match: member_values[match.group(1)], email_content)
             
+            log.debug("Personalized newsletter for %s", member_values['member_email'])
             return personalized_content
             
         except Exception as e:
             print(f"Error personalizing newsletter for member: {e}")
             return email_content
 
+    def replace_template_variables(self, text, values):
+        """Replace {{key}} and raw {{{key}}} placeholders with values in a single pass"""
+        def substitute(match):
+            key = match.group(2)
+            value = values.get(key)
+            # Leave unknown keys, the posts list and nested sections untouched
+            if key == 'posts' or key not in values or isinstance(value, dict):
+                return match.group(0)
+            return str(value) if value else ''
+        
+        return self.TEMPLATE_VARIABLE_RE.sub(substitute, text)
+
     def render_template(self, template, post):
         """Render the email template with post data"""
         try:
@@ -1895,8 +2040,7 @@ class GhostNewsletterSender:
                 formatted_date = datetime.now().strftime("%B %d, %Y")
             
             # Process content
-            processed_content = self.process_content(post_content)
-            processed_content = self.add_utm_tags(processed_content, post_url)
+            processed_content = self.process_content(post_content, add_utm=True)
             
             # Template variables
             template_vars = {
@@ -1910,7 +2054,7 @@ class GhostNewsletterSender:
                 'post_title': post_title,
                 'post_content': processed_content,
                 'website_url': self.ghost_website_url,
-                'footer_address': os.getenv('GHOST_NEWSLETTER_ADDRESS', f'{self.from_name}'),
+                'footer_address': self.footer_address,
                 'unsubscribe_url': '{{unsubscribe_url}}',  # Will be replaced per email
                 
                 # Add feedback URLs
@@ -1918,27 +2062,10 @@ class GhostNewsletterSender:
             }
             
             # Replace template variables
-            rendered = template
-            for key, value in template_vars.items():
-                if key == 'post_content':
-                    # Handle triple braces for raw HTML content
-                    placeholder = '{{{' + key + '}}}'
-                    rendered = rendered.replace(placeholder, str(value) if value else '')
-                else:
-                    # Handle double braces for escaped content
-                    placeholder = '{{' + key + '}}'
-                    rendered = rendered.replace(placeholder, str(value) if value else '')
-            
-            # Handle conditional featured image
-            if template_vars['featured_image']:
-                # If there's a featured image, just remove the conditional tags
-                rendered = rendered.replace('{{#if featured_image}}', '').replace('{{/if}}', '')
-            else:
-                # If no featured image, remove the entire section
-                import re
-                # Remove everything between {{#if featured_image}} and {{/if}} including the tags
-                pattern = r'{{#if featured_image}}.*?{{/if}}'
-                rendered = re.sub(pattern, '', rendered, flags=re.DOTALL)
+            rendered = self.replace_template_variables(template, template_vars)
+            
+            # Handle conditional featured image: keep the section without its tags, or drop it entirely
+            rendered = self.FEATURED_IMAGE_IF_RE.sub(r'\1' if template_vars['featured_image'] else '', rendered)
             
             return rendered
             
@@ -1946,45 +2073,40 @@ class GhostNewsletterSender:
             print(f"Error rendering template: {e}")
             return None
 
+    def build_email_message(self, to_addr, content, subject):
+        """Build a Postmark message payload for a single recipient"""
+        return {
+            "From": self._from_addr,
+            "To": to_addr,
+            "Subject": subject,
+            "HtmlBody": content,
+            "MessageStream": self.message_stream
+        }
+
     def send_email(self, to_addr, content, subject):
         """Send email using Postmark API"""
         try:
             # Prepare Postmark API request
             url = "https://api.postmarkapp.com/email"
             
-            headers = {
-                "Accept": "application/json",
-                "Content-Type": "application/json",
-                "X-Postmark-Server-Token": self.postmark_server_token
-            }
-            
-            # Format the From field with name (following Postmark format)
-            from_addr = f'"{self.from_name}" <{self.from_email}>' if self.from_name else self.from_email
-            
-            payload = {
-                "From": from_addr,
-                "To": to_addr,
-                "Subject": subject,
-                "HtmlBody": content,
-                "MessageStream": self.message_stream
-            }
+            payload = self.build_email_message(to_addr, content, subject)
             
-            response = requests.post(url, headers=headers, json=payload)
+            response = self.session.post(url, headers=self._postmark_headers, data=_json_dumps(payload), timeout=self.HTTP_TIMEOUT)
             
             if response.status_code == 200:
-                # Parse response to get MessageID for logging
-                try:
-                    response_data = response.json()
-                    message_id = response_data.get('MessageID', 'Unknown')
-                    if self.is_postmark_test_mode:
-                        print(f"🧪 Test email processed for {to_addr} (MessageID: {message_id})")
-                    else:
-                        print(f"Email sent successfully to {to_addr} (MessageID: {message_id})")
-                except:
-                    if self.is_postmark_test_mode:
-                        print(f"🧪 Test email processed for {to_addr}")
-                    else:
-                        print(f"Email sent successfully to {to_addr}")
+                # Only parse the response for its MessageID when running with --verbose
+                message_id = None
+                if log.isEnabledFor(logging.INFO):
+                    try:
+                        message_id = self._json(response).get('MessageID', 'Unknown')
+                    except (ValueError, AttributeError):
+                        pass
+                
+                details = f" (MessageID: {message_id})" if message_id else ""
+                if self.is_postmark_test_mode:
+                    print(f"🧪 Test email processed for {to_addr}{details}")
+                else:
+                    print(f"Email sent successfully to {to_addr}{details}")
                 return True
             elif response.status_code == 401:
                 print(f"Postmark authentication failed. Check your server token.")
@@ -2000,11 +2122,66 @@ class GhostNewsletterSender:
             print(f"Failed to send email to {to_addr}. Error: {e}")
             return False
 
+    def send_email_batch(self, body, to_addrs):
+        """Send one serialized Postmark batch (up to 500 messages / 50 MB), returning a success flag per recipient"""
+        try:
+            url = "https://api.postmarkapp.com/email/batch"
+            
+            response = self.session.post(url, headers=self._postmark_headers, data=body, timeout=self.POSTMARK_BATCH_TIMEOUT)
+            
+            if response.status_code == 401:
+                print(f"Postmark authentication failed. Check your server token.")
+                return [False] * len(to_addrs)
+            elif response.status_code != 200:
+                print(f"Postmark API error {response.status_code}: {response.text}")
+                return [False] * len(to_addrs)
+            
+            # Postmark returns one result per message, in order
+            results = []
+            for to_addr, result in zip(to_addrs, self._json(response)):
+                if result.get('ErrorCode') == 0:
+                    results.append(True)
+                else:
+                    log.warning("Invalid email data for %s: %s", to_addr, result.get('Message'))
+                    results.append(False)
+            
+            if self.is_postmark_test_mode:
+                print(f"🧪 Test batch processed for {len(to_addrs)} recipients")
+            
+            return results
+            
+        except Exception as e:
+            print(f"Failed to send batch of {len(to_addrs)} emails. Error: {e}")
+            return [False] * len(to_addrs)
+
+    @staticmethod
+    def _tally_batch_results(done, pending):
+        """Pop finished batch futures from pending, returning (sent, failed) counts for their recipients"""
+        sent_count = 0
+        failed_count = 0
+        for future in done:
+            batch_recipients = pending.pop(future)
+            for member, sent in zip(batch_recipients, future.result()):
+                # Per-recipient lines go through logging: successes only show with --verbose
+                if sent:
+                    sent_count += 1
+                    log.info("Sent to %s (%s)", member.get('email'), member.get('name', 'Unknown'))
+                else:
+                    failed_count += 1
+                    log.warning("Failed to send to %s", member.get('email'))
+        return sent_count, failed_count
+
     def send_newsletter(self, dry_run=True):
         """Main function to send newsletter"""
         try:
             print("🚀 Starting Ghost newsletter sender...")
             
+            # A sender built with require_postmark=False can inspect Ghost but not send
+            missing_vars = tuple(var for var in POSTMARK_REQUIRED_ENV_VARS if not os.environ.get(var))
+            if missing_vars:
+                print(f"Missing required environment variables: {', '.join(missing_vars)}")
+                return False
+            
             # Get recent posts with featured post prioritization
             print(f"📰 Fetching up to {self.max_posts} posts from the last {self.days_back} days...")
             recent_posts = self.get_prioritized_posts_for_newsletter(self.max_posts, self.days_back)
@@ -2050,8 +2227,8 @@ class GhostNewsletterSender:
                 print("Failed to render template. Exiting.")
                 return False
             
-            # Save rendered content for debugging if in dry run mode
-            if dry_run:
+            # Save rendered content for debugging in dry runs with GHOST_DEBUG=1
+            if dry_run and self.debug:
                 try:
                     # Use actual test member data if available
                     test_email = self.ghost_test_email or self.from_email
@@ -2064,8 +2241,8 @@ class GhostNewsletterSender:
                     
                     script_dir = os.path.dirname(os.path.realpath(__file__))
                     debug_path = os.path.join(script_dir, 'debug_newsletter.html')
-                    with open(debug_path, 'w', encoding='utf-8') as f:
-                        f.write(debug_content.replace('{{unsubscribe_url}}', '#unsubscribe'))
+                    with open(debug_path, 'wb') as f:
+                        f.write(debug_content.replace('{{unsubscribe_url}}', '#unsubscribe').encode('utf-8'))
                     print(f"🐛 Debug: Rendered newsletter saved to {debug_path}")
                 except Exception as e:
                     print(f"Warning: Could not save debug file: {e}")
@@ -2085,52 +2262,98 @@ class GhostNewsletterSender:
                     print(f"⚠️ Member not found for {test_email}, using mock data")
                     members = [{'email': test_email, 'name': 'Test User', 'created_at': '2024-01-01T00:00:00Z'}]
             else:
-                members = self.get_ghost_members()
-                
-            if not members:
-                print("No subscribers found. Exiting.")
-                return False
+                # Stream members so sending can start while later pages are still loading
+                members = self.iter_ghost_members()
+            
+            # Use newsletter name instead of blog title, with optional subject prefix
+            newsletter_name = newsletter_data['newsletter']['name']
+            subject_prefix = newsletter_data['newsletter']['settings'].get('subject_prefix')
+            
+            if subject_prefix:
+                email_subject = f"{subject_prefix} {newsletter_name}: {featured_post_title}"
+            else:
+                email_subject = f"{newsletter_name}: {featured_post_title}"
+            
+            # The Ghost portal unsubscribe link is the same for every member, so fill it in once
+            email_content = email_content.replace('{{unsubscribe_url}}', self.generate_unsubscribe_link())
             
-            print(f"📬 Sending to {len(members)} recipients...")
+            print(f"📬 Sending in batches of up to {self.POSTMARK_BATCH_SIZE} recipients...")
             
             # Send emails
             sent_count = 0
             failed_count = 0
             
-            for member in members:
-                try:
-                    # Get member email
-                    member_email = member.get('email', '')
-                    if not member_email:
-                        print(f"Skipping member with no email: {member}")
-                        continue
-                    
-                    # Generate personalized unsubscribe link
-                    unsubscribe_link = self.generate_unsubscribe_link(member_email)
-                    
-                    # Personalize content with member data
-                    personal_content = self.personalize_newsletter_for_member(email_content, member)
-                    personal_content = personal_content.replace('{{unsubscribe_url}}', unsubscribe_link)
-                    
-                    # Send email
-                    # Use newsletter name instead of blog title, with optional subject prefix
-                    newsletter_name = newsletter_data['newsletter']['name']
-                    subject_prefix = newsletter_data['newsletter']['settings'].get('subject_prefix')
+            with ThreadPoolExecutor(max_workers=self.send_concurrency) as executor:
+                # future -> recipients of that batch; at most send_concurrency batches are held at once,
+                # so members are only personalized as fast as Postmark accepts them
+                pending = {}
+                batch_recipients = []
+                batch_messages = []
+                batch_bytes = 2  # the enclosing [ and ]
+                
+                def submit_batch():
+                    """Wait for a free slot, then hand the current batch to the executor"""
+                    nonlocal sent_count, failed_count
+                    if len(pending) >= self.send_concurrency:
+                        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                        sent, failed = self._tally_batch_results(done, pending)
+                        sent_count += sent
+                        failed_count += failed
                     
-                    if subject_prefix:
-                        email_subject = f"{subject_prefix} {newsletter_name}: {featured_post_title}"
-                    else:
-                        email_subject = f"{newsletter_name}: {featured_post_title}"
-                    if self.send_email(member_email, personal_content, email_subject):
-                        sent_count += 1
-                        print(f"Sent to {member_email} ({member.get('name', 'Unknown')})")
-                    else:
-                        failed_count += 1
-                        print(f"Failed to send to {member_email}")
+                    body = b'[' + b','.join(batch_messages) + b']'
+                    to_addrs = [member['email'] for member in batch_recipients]
+                    pending[executor.submit(self.send_email_batch, body, to_addrs)] = list(batch_recipients)
+                
+                # If the member list fails part-way, finish the batches already built and report the send as incomplete
+                members_error = None
+                try:
+                    for member in members:
+                        try:
+                            # Get member email
+                            member_email = member.get('email', '')
+                            if not member_email:
+                                print(f"Skipping member with no email: {member}")
+                                continue
+                            
+                            # Personalize content with member data; serialize once, the batch body reuses the bytes
+                            personal_content = self.personalize_newsletter_for_member(email_content, member)
+                            message = _json_dumps(self.build_email_message(member_email, personal_content, email_subject))
+                        except Exception as e:
+                            failed_count += 1
+                            print(f"Error preparing email for {member.get('email', 'unknown')}: {e}")
+                            continue
+                        
+                        # Start a new batch when this message would exceed Postmark's count or size limit
+                        if batch_messages and (len(batch_messages) >= self.POSTMARK_BATCH_SIZE
+                                               or batch_bytes + len(message) + 1 > self.POSTMARK_BATCH_MAX_BYTES):
+                            submit_batch()
+                            batch_recipients.clear()
+                            batch_messages.clear()
+                            batch_bytes = 2
                         
+                        batch_recipients.append(member)
+                        batch_messages.append(message)
+                        batch_bytes += len(message) + 1
                 except Exception as e:
-                    failed_count += 1
-                    print(f"Error sending to {member.get('email', 'unknown')}: {e}")
+                    members_error = e
+                
+                if batch_messages:
+                    submit_batch()
+                
+                # Collect the batches still in flight
+                sent, failed = self._tally_batch_results(list(pending), pending)
+                sent_count += sent
+                failed_count += failed
+            
+            if members_error is not None:
+                print(f"❌ Member list incomplete, remaining subscribers were not sent to: {members_error}")
+                print(f"   Sent before the failure: {sent_count}")
+                print(f"   Failed: {failed_count}")
+                return False
+            
+            if sent_count == 0 and failed_count == 0:
+                print("No subscribers found. Exiting.")
+                return False
             
             print(f"📊 Newsletter sending complete:")
             print(f"   Sent: {sent_count}")
@@ -2164,17 +2387,36 @@ def main():
         parser.add_argument('--check-newsletter', action='store_true', help='Check newsletter configuration and design settings from Ghost API')
         parser.add_argument('--check-theme', action='store_true', help='Check theme information from Ghost API')
         parser.add_argument('--analyze-branding', action='store_true', help='Comprehensive analysis of branding capabilities and recommendations')
+        parser.add_argument('--verbose', action='store_true', help='Show detailed diagnostic output')
         
         args = parser.parse_args()
         
-        # Create newsletter sender with configuration
+        # Diagnostics are logged at INFO; show them when asked for or when checking branding.
+        # GHOST_DEBUG=1 (from the environment or .env) also shows template rendering details.
+        load_env()
+        verbose = args.verbose or args.check_branding or args.analyze_branding
+        if os.getenv('GHOST_DEBUG') == '1':
+            level = logging.DEBUG
+        else:
+            level = logging.INFO if verbose else logging.WARNING
+        # Configure this module's logger only, so third-party loggers (urllib3) stay quiet
+        handler = logging.StreamHandler(sys.stdout)
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        log.addHandler(handler)
+        log.setLevel(level)
+        log.propagate = False
+        
+        # Create newsletter sender with configuration; the --check-* and --analyze-* commands
+        # only talk to Ghost, so they don't need Postmark settings
+        checks_only = args.check_branding or args.check_newsletter or args.check_theme or args.analyze_branding
         sender = GhostNewsletterSender(
             max_posts=args.max_posts,
             days_back=args.days_back,
             newsletter_interval=args.interval,
             filter_tags=args.filter_tags,
             featured_only=args.featured_only,
-            auto_interval=args.auto_interval
+            auto_interval=args.auto_interval,
+            require_postmark=not checks_only
         )
         
         # Check branding settings if requested
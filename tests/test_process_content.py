@@ -0,0 +1,42 @@
+import os
+import sys
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ghost import GhostNewsletterSender
+
+TEST_ENV = {
+    'GHOST_ADMIN_API_KEY': 'id:00',
+    'GHOST_ADMIN_URL': 'https://example.com',
+    'GHOST_WEBSITE_URL': 'https://example.com',
+    'WEBSITE_DOMAIN': 'example.com',
+}
+
+HTML_CARD = '<!--kg-card-begin: html--><div class="embed"><p>Embedded <a href="https://example.com/post/">post</a></p></div><!--kg-card-end: html-->'
+
+
+class ProcessContentTest(unittest.TestCase):
+    def setUp(self):
+        with mock.patch.dict(os.environ, TEST_ENV):
+            self.sender = GhostNewsletterSender(require_postmark=False)
+
+    def test_html_card_keeps_comment_markers(self):
+        """Ghost's HTML card comes back whole, with both markers and the content styled"""
+        processed = self.sender.process_content(HTML_CARD, add_utm=True)
+        self.assertTrue(processed.startswith('<!--kg-card-begin: html--><div class="embed">'))
+        self.assertTrue(processed.endswith('</div><!--kg-card-end: html-->'))
+        self.assertIn('<p style="', processed)
+        self.assertIn('href="https://example.com/post/?utm_source=example.com', processed)
+
+    def test_html_card_after_other_content(self):
+        """An HTML card later in the post keeps its markers in place"""
+        content = '<p>Intro</p>' + HTML_CARD
+        processed = self.sender.process_content(content)
+        self.assertEqual(processed.count('<!--kg-card-begin: html-->'), 1)
+        self.assertLess(processed.index('Intro'), processed.index('<!--kg-card-begin: html-->'))
+
+
+if __name__ == '__main__':
+    unittest.main()